@@ -8,13 +8,28 @@ generating test images, testing NudeNet filtering, and validating configurations
 
 import sys
 import os
+import io
 import json
+import time
+import base64
+import shutil
+import sqlite3
+import atexit
 import asyncio
+import platform
 import threading
 import tempfile
+import importlib.util
+import logging
+import functools
+import itertools
+import traceback
+import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+from typing import Dict, Any, Mapping, Optional, List, Union
+from datetime import datetime, timedelta, timezone
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent))
@@ -23,20 +38,104 @@ sys.path.append(str(Path(__file__).parent))
 try:
     import tkinter as tk
     from tkinter import ttk, scrolledtext, filedialog, messagebox
-    from PIL import Image, ImageTk
+    from PIL import Image, ImageTk, ImageDraw, ImageFont
 except ImportError:
     print("❌ GUI dependencies not installed. Run: pip install pillow")
     sys.exit(1)
 
+# Faster JSON for MCP tool parameters and results when available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Project imports
 from modules.stable_diffusion.sd_client import SDClient
 from modules.stable_diffusion.chevereto_client import CheveretoClient, CheveretoConfig
 from modules.llm.llm_manager import LLMManager
 from modules.stable_diffusion.content_db import ContentDatabase
 from modules.stable_diffusion.models import GenerateImageInput
-from modules.config import get_mcp_config
+from modules.config import get_mcp_config, read_mcp_json, refresh_path_caches
 import httpx
 
+# Discord bot tokens start with "MT" followed by one of these characters
+_DISCORD_VALID_THIRD = frozenset('AMI')
+
+# Optional MCP.json variables reported by validate_configuration; secrets are masked
+_OPTIONAL_MCP_VARS = ("DISCORD_BOT_TOKEN", "CHEVERETO_BASE_URL", "CHEVERETO_GUEST_API_KEY", "CHEVERETO_USER_API_KEY")
+_SECRET_MCP_VARS = frozenset({"DISCORD_BOT_TOKEN", "CHEVERETO_GUEST_API_KEY", "CHEVERETO_USER_API_KEY"})
+
+# Linux terminal emulators in preference order, with the flag that runs a command argv
+_TERMINAL_EXEC_FLAGS = {
+    "gnome-terminal": "--",
+    "konsole": "-e",
+    "xfce4-terminal": "-x",
+    "xterm": "-e",
+    "terminator": "-x",
+}
+
+# Maximum lines kept in the SD status log before the oldest are dropped
+_MAX_LOG_LINES = 1000
+
+# Maximum lines kept in widgets written through log_message (status, services, databases, analysis)
+_MAX_WIDGET_LOG_LINES = 2000
+
+# Maximum NudeNet log lines buffered between flushes; older unflushed lines are dropped
+_MAX_PENDING_LOG = 1000
+
+# Large JSON results are written to Tk text widgets in pieces of about this many characters
+_JSON_INSERT_CHUNK = 64 * 1024
+
+# Shared client for quick "is the HTTP server up" checks
+_probe_client = httpx.Client(timeout=3)
+atexit.register(_probe_client.close)
+
+# Tk 8.6+ reads raw PNG bytes in PhotoImage(data=...), older versions need base64
+_TK_RAW_PNG = tk.TkVersion >= 8.6
+
+# PhotoImage creation methods, in order of preference
+_PHOTO_METHODS = ('direct', 'buffer', 'b64', 'jpeg')
+
+# Default PIL font for mock images, loaded on first use
+_DEFAULT_FONT = None
+_MOCK_IMAGE_TEXT = "Test Image\n{}\n{} steps\n{}x{}"
+
+def _json_pretty(obj, default=None) -> str:
+    """Serialize obj as JSON indented by 2 spaces"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=default,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, indent=2, default=default)
+
+@functools.lru_cache(maxsize=256)
+def _mask_key(key: str) -> str:
+    """Show only the first 8 characters of an API key or token"""
+    if key == "Not set" or not key:
+        return "Not set"
+    return f"{key[:8]}..." if len(key) > 8 else key
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+def _fast_copy(src: Path, dst: Path) -> None:
+    """Copy a file in-kernel with copy_file_range, falling back to shutil.copyfile"""
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(in_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            remaining = os.fstat(in_fd).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(in_fd, out_fd, remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+    except (AttributeError, OSError):
+        # No copy_file_range (non-Linux) or unsupported across these filesystems
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
 class ToolTip:
     """Create a tooltip for a given widget"""
     def __init__(self, widget, text):
@@ -153,6 +252,45 @@ class SDMCPTester:
         self.test_results = {}
         self.tooltips = {}
         self.last_sd_image = None  # Track last generated SD image for import
+        self._last_valid_token = None  # Last Discord token that passed validation
+        self._last_discord_result = None
+        self._photo_method = None  # PhotoImage creation method, detected on first display
+        self._scratch_buf = io.BytesIO()  # Reused for in-memory image round-trips
+        # RAM-backed directory for throwaway test images when available
+        self._scratch_dir = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+        self.debug_display = False  # Verbose image display diagnostics (DEBUG_DISPLAY)
+        self._httpx = None  # Persistent async client for progress polling and component tests
+        self._gen_defaults = {}  # GenerateImageInput defaults, built from config
+        self._pending_display = {}  # label_key -> latest image path awaiting display
+        self._display_scheduled = False
+        self._display_lock = threading.Lock()  # Guards the two fields above across worker threads
+        self._photo_cache = {}  # label_key -> ImageTk.PhotoImage reused for same-size images
+        self._last_gen_done = threading.Event()  # Set when generate_test_image finishes
+        self._nudenet_log_pending = deque(maxlen=_MAX_PENDING_LOG)  # (seq, line) NudeNet lines awaiting the next flush
+        self._nudenet_log_seq = itertools.count()  # Orders NudeNet lines against report replacements
+        self._nudenet_flush_scheduled = False
+        self._log_pending = deque()  # (widget, line) pairs from log_message; the flush trims each widget
+        self._log_flush_scheduled = False
+        self._test_image_cache = {}  # color -> cached upload test PNG path
+        self._tool_functions = None  # MCP tool name -> function, imported on first use
+        self._health_mod = None  # health_check.py, imported on first run
+        
+        # Platform details for launching services, probed once
+        self._repo_dir = Path(__file__).parent
+        self._system = platform.system().lower()
+        self._linux_terminal = next(
+            (t for t in _TERMINAL_EXEC_FLAGS if shutil.which(t)), None
+        )
+        
+        # Shared event loop for async work started from GUI threads
+        self._bg_loop = asyncio.new_event_loop()
+        threading.Thread(target=self._bg_loop.run_forever, daemon=True).start()
+        
+        # Local content analysis keeps one ContentDatabase open; its SQLite connection is
+        # bound to the thread that opened it, so all use goes through this single worker
+        self._analysis_db = None
+        self._analysis_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="content-db")
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         
         # Setup GUI
         self.setup_gui()
@@ -168,6 +306,15 @@ class SDMCPTester:
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
+        # Debug menu
+        menubar = tk.Menu(self.root)
+        debug_menu = tk.Menu(menubar, tearoff=0)
+        self.debug_display_var = tk.BooleanVar(value=self.debug_display)
+        debug_menu.add_checkbutton(label="Verbose Image Diagnostics", variable=self.debug_display_var,
+                                   command=self.toggle_debug_display)
+        menubar.add_cascade(label="Debug", menu=debug_menu)
+        self.root.config(menu=menubar)
+        
         # Create tabs
         self.create_system_status_tab()
         self.create_sd_testing_tab()
@@ -177,6 +324,11 @@ class SDMCPTester:
         self.create_content_analysis_tab()
         self.create_config_tab()
         
+    def toggle_debug_display(self):
+        """Toggle verbose image display diagnostics and error tracebacks"""
+        self.debug_display = self.debug_display_var.get()
+        self.log_sd_message(f"🔍 Verbose image diagnostics {'enabled' if self.debug_display else 'disabled'}")
+    
     def create_system_status_tab(self):
         """System status and health checks"""
         frame = ttk.Frame(self.notebook)
@@ -435,6 +587,7 @@ class SDMCPTester:
             ("generate_image", "Generate image"),
             ("upload_image", "Upload image to Chevereto"),
         ]
+        self._mcp_tool_desc = dict(self.mcp_tools)
         
         # Parameter templates for each tool (based on actual MCP tool signatures)
         self.mcp_tool_params = {
@@ -670,15 +823,42 @@ class SDMCPTester:
                                                        font=("Consolas", 9))
         self.config_results.pack(fill=tk.BOTH, expand=True)
     
+    def run_async(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the shared background loop and wait for its result"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._bg_loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+    
     def log_message(self, message: str, widget: Optional[tk.Text] = None):
         """Log a message to the specified widget or default status text"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {message}\n"
+        formatted_message = f"[{time.strftime('%H:%M:%S')}] {message}\n"
         
+        # Buffer and write on the next idle instead of pumping the event loop per line
         target_widget = widget or self.status_text
-        target_widget.insert(tk.END, formatted_message)
-        target_widget.see(tk.END)
-        self.root.update()
+        self._log_pending.append((target_widget, formatted_message))
+        if not self._log_flush_scheduled:
+            self._log_flush_scheduled = True
+            self.root.after_idle(self._flush_log_messages)
+    
+    def _flush_log_messages(self):
+        """Write buffered log messages, one insert per run of messages for the same widget"""
+        self._log_flush_scheduled = False
+        pending = self._log_pending
+        batches = []
+        while pending:
+            widget, text = pending.popleft()
+            if batches and batches[-1][0] is widget:
+                batches[-1][1].append(text)
+            else:
+                batches.append((widget, [text]))
+        
+        for widget, parts in batches:
+            widget.insert(tk.END, "".join(parts))
+            self.trim_log_widget(widget, _MAX_WIDGET_LOG_LINES)
+            widget.see(tk.END)
     
     def log_sd_message(self, message: str):
         """Log message to SD testing status area"""
@@ -688,31 +868,57 @@ class SDMCPTester:
         # Log to SD status area if it exists, otherwise fall back to main log
         if hasattr(self, 'sd_status_text'):
             self.sd_status_text.insert(tk.END, formatted_message)
+            self.trim_log_widget(self.sd_status_text, _MAX_LOG_LINES)
             self.sd_status_text.see(tk.END)
         else:
             # Fallback to main log if SD status area not ready yet
             self.status_text.insert(tk.END, formatted_message)
             self.status_text.see(tk.END)
             
+    def trim_log_widget(self, widget: tk.Text, max_lines: int):
+        """Drop the oldest lines so a log widget never exceeds max_lines"""
+        line_count = int(widget.index("end-1c").split(".")[0])
+        if line_count > max_lines:
+            widget.delete("1.0", f"{line_count - max_lines + 1}.0")
+    
     def log_nudenet_message(self, message: str):
         """Log message to NudeNet testing status area"""
         timestamp = datetime.now().strftime("%H:%M:%S")
         formatted_message = f"[{timestamp}] {message}\n"
         
-        # Log to NudeNet detection text area if available
+        # Log to NudeNet detection text area if available, batched until the next idle
         if hasattr(self, 'detection_text'):
-            current_text = self.detection_text.get("1.0", tk.END)
-            # If the text area only has default content, clear it first
-            if "NudeNet Detection Results" not in current_text:
-                self.detection_text.delete("1.0", tk.END)
-            self.detection_text.insert(tk.END, formatted_message)
-            self.detection_text.see(tk.END)
+            self._nudenet_log_pending.append((next(self._nudenet_log_seq), formatted_message))
+            if not self._nudenet_flush_scheduled:
+                self._nudenet_flush_scheduled = True
+                self.root.after_idle(self._flush_nudenet_log)
         else:
-            # Fallback to main log if SD status area not ready yet
-            self.status_text.insert(tk.END, formatted_message)
-            self.status_text.see(tk.END)
-            
-        self.root.update()
+            # Fallback to main log if SD status area not ready yet (log_message adds its own timestamp)
+            self.log_message(message)
+    
+    def _replace_nudenet_log(self, report: str, cutoff: int):
+        """Replace the detection text with a report, dropping lines logged before it (Tk thread)"""
+        pending = self._nudenet_log_pending
+        while pending and pending[0][0] < cutoff:
+            pending.popleft()
+        self.detection_text.replace("1.0", tk.END, report)
+    
+    def _flush_nudenet_log(self):
+        """Write buffered NudeNet messages to the detection text area in one insert"""
+        self._nudenet_flush_scheduled = False
+        pending = self._nudenet_log_pending
+        parts = []
+        while pending:
+            parts.append(pending.popleft()[1])
+        if not parts:
+            return
+        
+        current_text = self.detection_text.get("1.0", tk.END)
+        # If the text area only has default content, clear it first
+        if "NudeNet Detection Results" not in current_text:
+            self.detection_text.delete("1.0", tk.END)
+        self.detection_text.insert(tk.END, "".join(parts))
+        self.detection_text.see(tk.END)
     
     def update_component_status(self, component: str, status_text: str, tooltip_text: str):
         """Update component status display and tooltip"""
@@ -767,8 +973,7 @@ class SDMCPTester:
         
         try:
             if mcp_path.exists():
-                with open(mcp_path) as f:
-                    mcp_config = json.load(f)
+                mcp_config = read_mcp_json(mcp_path)
                 
                 # Extract SD MCP Server environment
                 env_vars = mcp_config.get("mcpServers", {}).get("SD_MCP_Server", {}).get("env", {})
@@ -796,6 +1001,12 @@ class SDMCPTester:
             self._mcp_vars = set()
             return {}
     
+    def _mcp_env(self) -> Mapping[str, str]:
+        """Get MCP.json env vars from the shared config, loading it only once"""
+        if not self.mcp_config.is_loaded:
+            self.mcp_config.load_config()
+        return self.mcp_config.env_vars
+    
     def get_mcp_variables(self):
         """Get the set of variables loaded from MCP.json"""
         return getattr(self, '_mcp_vars', set())
@@ -816,11 +1027,29 @@ class SDMCPTester:
                 "IMAGE_OUT_PATH": os.getenv("IMAGE_OUT_PATH", "/tmp/images"),
                 "NSFW_FILTER": os.getenv("NSFW_FILTER", "true").lower() == "true",
                 # Add all MCP.json variables to config
-                **{k: os.getenv(k, "") for k in mcp_vars.keys()}
+                **{k: os.getenv(k, "") for k in mcp_vars.keys()},
+                # GUI display options (after MCP.json vars so they stay booleans)
+                "VERIFY_IMAGES": os.getenv("VERIFY_IMAGES", "false").lower() == "true",
+                "DEBUG_DISPLAY": os.getenv("DEBUG_DISPLAY", "false").lower() == "true"
+            }
+            self.debug_display = self.config.get("DEBUG_DISPLAY", False)
+            self.debug_display_var.set(self.debug_display)
+            
+            # Fixed generation parameters - only prompt, steps and size vary per request
+            self._gen_defaults = {
+                "negative_prompt": "blurry, low quality, watermark",
+                "cfg_scale": 7.0,
+                "sampler_name": "Euler",
+                "seed": -1,
+                "batch_size": 1,
+                "output_path": self.config.get("IMAGE_OUT_PATH", "/tmp/images")
             }
             
             self.log_message(f"🔧 Initializing clients with MCP.json configuration...")
             
+            # SD_BASE_URL may have changed - rebuild the async client on next use
+            self._close_async_client()
+            
             # Initialize SD Client with NudeNet config from MCP.json
             if self.config["SD_BASE_URL"]:
                 # Build NudeNet config from MCP.json environment variables
@@ -880,6 +1109,7 @@ class SDMCPTester:
             self.content_db = None
             
             # Reload configuration and reinitialize
+            self.mcp_config.load_config()
             self.load_configuration()
             self.initialize_clients()
             
@@ -910,8 +1140,12 @@ class SDMCPTester:
         """Auto-detect MCP.json file location using the MCP config system"""
         self.log_message("🔍 Auto-detecting MCP.json location...")
         
-        # Get common paths from MCP config
-        possible_paths = self.mcp_config.get_common_mcp_paths()
+        # Get common paths from MCP config, with the MCP_JSON_PATH override first
+        refresh_path_caches()
+        possible_paths = list(self.mcp_config.get_common_mcp_paths())
+        env_path = os.getenv("MCP_JSON_PATH")
+        if env_path:
+            possible_paths.insert(0, Path(env_path))
         
         found_paths = []
         for path in possible_paths:
@@ -963,69 +1197,62 @@ class SDMCPTester:
         
         # Run async tests in thread
         def run_tests():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            component_names = {
+                "sd_webui": "SD WebUI",
+                "lm_studio": "LM Studio", 
+                "chevereto": "Chevereto",
+                "nudenet": "NudeNet",
+                "databases": "Databases",
+                "discord_bot": "Discord Bot"
+            }
             
-            try:
-                component_names = {
-                    "sd_webui": "SD WebUI",
-                    "lm_studio": "LM Studio", 
-                    "chevereto": "Chevereto",
-                    "nudenet": "NudeNet",
-                    "databases": "Databases",
-                    "discord_bot": "Discord Bot"
-                }
+            for component in self.status_vars.keys():
+                component_name = component_names.get(component, component)
+                self.log_message(f"Testing {component_name}...")
+                
+                # Update status display
+                self.update_component_status(component, "🔄 Testing...", "Testing component...")
+                
+                result = self.run_async(self.test_component_async(component))
                 
-                for component in self.status_vars.keys():
-                    component_name = component_names.get(component, component)
-                    self.log_message(f"Testing {component_name}...")
+                if result["success"]:
+                    message = result.get('message', 'OK')
+                    full_message = f"✅ {message}"
                     
-                    # Update status display
-                    self.update_component_status(component, "🔄 Testing...", "Testing component...")
+                    # Create detailed tooltip
+                    tooltip_text = f"{component_name} Status:\n{message}\n"
+                    if result.get('endpoint'):
+                        tooltip_text += f"\nEndpoint: {result['endpoint']}"
+                    tooltip_text += f"\nLast tested: {datetime.now().strftime('%H:%M:%S')}"
                     
-                    result = loop.run_until_complete(self.test_component_async(component))
+                    self.update_component_status(component, full_message, tooltip_text)
+                    self.log_message(f"✅ {component_name}: {message}")
+                else:
+                    error = result.get('error', 'Failed')
+                    suggestion = result.get('suggestion', '')
+                    endpoint = result.get('endpoint', '')
                     
-                    if result["success"]:
-                        message = result.get('message', 'OK')
-                        full_message = f"✅ {message}"
-                        
-                        # Create detailed tooltip
-                        tooltip_text = f"{component_name} Status:\n{message}\n"
-                        if result.get('endpoint'):
-                            tooltip_text += f"\nEndpoint: {result['endpoint']}"
-                        tooltip_text += f"\nLast tested: {datetime.now().strftime('%H:%M:%S')}"
-                        
-                        self.update_component_status(component, full_message, tooltip_text)
-                        self.log_message(f"✅ {component_name}: {message}")
-                    else:
-                        error = result.get('error', 'Failed')
-                        suggestion = result.get('suggestion', '')
-                        endpoint = result.get('endpoint', '')
-                        
-                        full_error = f"❌ {error}"
-                        
-                        # Create detailed tooltip with suggestion
-                        tooltip_text = f"{component_name} Error:\n{error}\n"
-                        if endpoint:
-                            tooltip_text += f"\nEndpoint: {endpoint}"
-                        if suggestion:
-                            tooltip_text += f"\nSuggestion: {suggestion}"
-                        tooltip_text += f"\nLast tested: {datetime.now().strftime('%H:%M:%S')}"
-                        
-                        self.update_component_status(component, full_error, tooltip_text)
-                        
-                        # Log detailed error with suggestion
-                        log_message = f"❌ {component_name}: {error}"
-                        if endpoint:
-                            log_message += f" (at {endpoint})"
-                        if suggestion:
-                            log_message += f" - {suggestion}"
-                        self.log_message(log_message)
-                
-                self.log_message("🎉 System test completed!")
-                
-            finally:
-                loop.close()
+                    full_error = f"❌ {error}"
+                    
+                    # Create detailed tooltip with suggestion
+                    tooltip_text = f"{component_name} Error:\n{error}\n"
+                    if endpoint:
+                        tooltip_text += f"\nEndpoint: {endpoint}"
+                    if suggestion:
+                        tooltip_text += f"\nSuggestion: {suggestion}"
+                    tooltip_text += f"\nLast tested: {datetime.now().strftime('%H:%M:%S')}"
+                    
+                    self.update_component_status(component, full_error, tooltip_text)
+                    
+                    # Log detailed error with suggestion
+                    log_message = f"❌ {component_name}: {error}"
+                    if endpoint:
+                        log_message += f" (at {endpoint})"
+                    if suggestion:
+                        log_message += f" - {suggestion}"
+                    self.log_message(log_message)
+            
+            self.log_message("🎉 System test completed!")
         
         threading.Thread(target=run_tests, daemon=True).start()
     
@@ -1034,53 +1261,53 @@ class SDMCPTester:
         base_url = os.getenv("SD_BASE_URL", "http://localhost:7860")
         
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                # Test basic API
-                samplers_url = f"{base_url}/sdapi/v1/samplers"
-                self.log_message(f"🔍 Testing SD WebUI at: {base_url}")
+            client = self._get_async_client()
+            # Test basic API
+            samplers_url = f"{base_url}/sdapi/v1/samplers"
+            self.log_message(f"🔍 Testing SD WebUI at: {base_url}")
                 
-                try:
-                    response = await client.get(samplers_url)
-                    if response.status_code != 200:
-                        return {
-                            "success": False, 
-                            "error": f"HTTP {response.status_code} from {base_url}",
-                            "endpoint": base_url,
-                            "suggestion": "Check if SD WebUI is running with --api flag"
-                        }
-                    
-                    samplers = response.json()
-                    
-                except httpx.ConnectError:
-                    return {
-                        "success": False,
-                        "error": f"Connection refused to {base_url}",
-                        "endpoint": base_url,
-                        "suggestion": "Start SD WebUI with: ./webui.sh --api --listen"
-                    }
-                except httpx.TimeoutException:
+            try:
+                response = await client.get(samplers_url, timeout=10)
+                if response.status_code != 200:
                     return {
-                        "success": False,
-                        "error": f"Connection timeout to {base_url}",
+                        "success": False, 
+                        "error": f"HTTP {response.status_code} from {base_url}",
                         "endpoint": base_url,
-                        "suggestion": "Check network connectivity and SD WebUI status"
+                        "suggestion": "Check if SD WebUI is running with --api flag"
                     }
-                
-                # Test models endpoint
-                try:
-                    models_url = f"{base_url}/sdapi/v1/sd-models"
-                    response = await client.get(models_url)
-                    models = response.json() if response.status_code == 200 else []
-                except:
-                    models = []  # Models endpoint sometimes fails, but samplers working is enough
-                
+                    
+                samplers = response.json()
+                    
+            except httpx.ConnectError:
                 return {
-                    "success": True,
-                    "message": f"Connected to {base_url} - {len(samplers)} samplers, {len(models)} models",
+                    "success": False,
+                    "error": f"Connection refused to {base_url}",
                     "endpoint": base_url,
-                    "samplers": len(samplers),
-                    "models": len(models)
+                    "suggestion": "Start SD WebUI with: ./webui.sh --api --listen"
                 }
+            except httpx.TimeoutException:
+                return {
+                    "success": False,
+                    "error": f"Connection timeout to {base_url}",
+                    "endpoint": base_url,
+                    "suggestion": "Check network connectivity and SD WebUI status"
+                }
+                
+            # Test models endpoint
+            try:
+                models_url = f"{base_url}/sdapi/v1/sd-models"
+                response = await client.get(models_url, timeout=10)
+                models = response.json() if response.status_code == 200 else []
+            except:
+                models = []  # Models endpoint sometimes fails, but samplers working is enough
+                
+            return {
+                "success": True,
+                "message": f"Connected to {base_url} - {len(samplers)} samplers, {len(models)} models",
+                "endpoint": base_url,
+                "samplers": len(samplers),
+                "models": len(models)
+            }
                 
         except Exception as e:
             return {
@@ -1095,44 +1322,44 @@ class SDMCPTester:
         base_url = os.getenv("LM_STUDIO_BASE_URL", "http://localhost:1234")
         
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                models_url = f"{base_url}/v1/models"
-                self.log_message(f"🔍 Testing LM Studio at: {base_url}")
+            client = self._get_async_client()
+            models_url = f"{base_url}/v1/models"
+            self.log_message(f"🔍 Testing LM Studio at: {base_url}")
                 
-                try:
-                    response = await client.get(models_url)
-                    if response.status_code != 200:
-                        return {
-                            "success": False, 
-                            "error": f"HTTP {response.status_code} from {base_url}",
-                            "endpoint": base_url,
-                            "suggestion": "Check if LM Studio is running with API enabled"
-                        }
-                    
-                    models = response.json()
-                    model_count = len(models.get("data", []))
-                    
+            try:
+                response = await client.get(models_url, timeout=10)
+                if response.status_code != 200:
                     return {
-                        "success": True,
-                        "message": f"Connected to {base_url} - {model_count} models loaded",
+                        "success": False, 
+                        "error": f"HTTP {response.status_code} from {base_url}",
                         "endpoint": base_url,
-                        "models": model_count
+                        "suggestion": "Check if LM Studio is running with API enabled"
                     }
                     
-                except httpx.ConnectError:
-                    return {
-                        "success": False,
-                        "error": f"Connection refused to {base_url}",
-                        "endpoint": base_url,
-                        "suggestion": "Start LM Studio and ensure API server is running"
-                    }
-                except httpx.TimeoutException:
-                    return {
-                        "success": False,
-                        "error": f"Connection timeout to {base_url}",
-                        "endpoint": base_url,
-                        "suggestion": "Check LM Studio status and network connectivity"
-                    }
+                models = response.json()
+                model_count = len(models.get("data", []))
+                    
+                return {
+                    "success": True,
+                    "message": f"Connected to {base_url} - {model_count} models loaded",
+                    "endpoint": base_url,
+                    "models": model_count
+                }
+                    
+            except httpx.ConnectError:
+                return {
+                    "success": False,
+                    "error": f"Connection refused to {base_url}",
+                    "endpoint": base_url,
+                    "suggestion": "Start LM Studio and ensure API server is running"
+                }
+            except httpx.TimeoutException:
+                return {
+                    "success": False,
+                    "error": f"Connection timeout to {base_url}",
+                    "endpoint": base_url,
+                    "suggestion": "Check LM Studio status and network connectivity"
+                }
                 
         except Exception as e:
             return {
@@ -1193,38 +1420,38 @@ class SDMCPTester:
         try:
             base_url = os.getenv("SD_BASE_URL", "http://localhost:7860")
             
-            async with httpx.AsyncClient(timeout=10) as client:
-                # Check if NudeNet extension endpoint exists
-                response = await client.get(f"{base_url}/sdapi/v1/extensions")
+            client = self._get_async_client()
+            # Check if NudeNet extension endpoint exists
+            response = await client.get(f"{base_url}/sdapi/v1/extensions", timeout=10)
                 
-                if response.status_code == 200:
-                    extensions = response.json()
-                    nudenet_found = False
+            if response.status_code == 200:
+                extensions = response.json()
+                nudenet_found = False
                     
-                    # Handle different response formats
-                    for ext in extensions:
-                        ext_name = ""
-                        if isinstance(ext, dict):
-                            # Extension is a dict, look for name field
-                            ext_name = ext.get("name", "").lower()
-                        elif isinstance(ext, str):
-                            # Extension is a string
-                            ext_name = ext.lower()
-                        else:
-                            # Convert to string as fallback
-                            ext_name = str(ext).lower()
+                # Handle different response formats
+                for ext in extensions:
+                    ext_name = ""
+                    if isinstance(ext, dict):
+                        # Extension is a dict, look for name field
+                        ext_name = ext.get("name", "").lower()
+                    elif isinstance(ext, str):
+                        # Extension is a string
+                        ext_name = ext.lower()
+                    else:
+                        # Convert to string as fallback
+                        ext_name = str(ext).lower()
                         
-                        if "nudenet" in ext_name or "nsfw" in ext_name:
-                            nudenet_found = True
-                            break
+                    if "nudenet" in ext_name or "nsfw" in ext_name:
+                        nudenet_found = True
+                        break
                     
-                    if nudenet_found:
-                        return {"success": True, "message": "NudeNet extension detected"}
-                    else:
-                        return {"success": False, "error": "NudeNet extension not found"}
+                if nudenet_found:
+                    return {"success": True, "message": "NudeNet extension detected"}
                 else:
-                    # Fallback: assume available if SD WebUI is running
-                    return {"success": True, "message": "Cannot detect extensions, assuming available"}
+                    return {"success": False, "error": "NudeNet extension not found"}
+            else:
+                # Fallback: assume available if SD WebUI is running
+                return {"success": True, "message": "Cannot detect extensions, assuming available"}
                 
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -1270,11 +1497,7 @@ class SDMCPTester:
     async def test_discord_bot(self) -> Dict[str, Any]:
         """Test Discord bot status and configuration"""
         try:
-            config = get_mcp_config()
-            # Fix: Load config first, then get env vars
-            if not config.is_loaded:
-                config.load_config()
-            env_vars = config.env_vars if hasattr(config, 'env_vars') else {}
+            env_vars = self._mcp_env()
             
             # Check if Discord is enabled in config
             discord_enabled = env_vars.get('ENABLE_DISCORD', '').lower() == 'true'
@@ -1298,14 +1521,18 @@ class SDMCPTester:
                     "endpoint": "Config: DISCORD_BOT_TOKEN"
                 }
             
+            # Same token already validated - skip the dependency probe
+            if discord_token == self._last_valid_token:
+                return self._last_discord_result
+            
             # Check if discord_bot.py exists and can be imported
             try:
-                import subprocess
-                import sys
                 
-                # Check if Discord dependencies are available
-                result = subprocess.run([sys.executable, "-c", "import discord; print('Discord.py available')"], 
-                                      capture_output=True, text=True, timeout=10)
+                # Check if Discord dependencies are available (in a thread, off the shared loop)
+                result = await asyncio.to_thread(
+                    subprocess.run, [sys.executable, "-c", "import discord; print('Discord.py available')"],
+                    capture_output=True, text=True, timeout=10
+                )
                 if result.returncode != 0:
                     return {
                         "success": False,
@@ -1325,7 +1552,8 @@ class SDMCPTester:
                     }
                 
                 # Try to validate token format (basic check)
-                if not discord_token.startswith(('MTA', 'MTM', 'MTI')):  # Common Discord token prefixes
+                if not (len(discord_token) >= 3 and discord_token.startswith('MT')
+                        and discord_token[2] in _DISCORD_VALID_THIRD):  # Common Discord token prefixes
                     return {
                         "success": False,
                         "error": "Invalid Discord token format",
@@ -1333,13 +1561,15 @@ class SDMCPTester:
                         "endpoint": f"Token: {discord_token[:10]}..."
                     }
                 
-                return {
+                self._last_discord_result = {
                     "success": True,
                     "message": f"Discord bot configured (token: {discord_token[:10]}...)",
                     "status": "configured",
                     "endpoint": f"Token: {discord_token[:10]}...",
                     "note": "Use 'python discord_bot.py' to start bot"
                 }
+                self._last_valid_token = discord_token
+                return self._last_discord_result
                 
             except subprocess.TimeoutExpired:
                 return {
@@ -1365,11 +1595,9 @@ class SDMCPTester:
             return
         
         self.log_message(f"🎨 Generating image: {prompt}")
+        self._last_gen_done.clear()
         
         def run_generation():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
             try:
                 # Parse size
                 try:
@@ -1387,11 +1615,12 @@ class SDMCPTester:
                 self.log_message("🔄 Starting image generation...")
                 
                 # Use real SD client for generation with progress monitoring
-                result = loop.run_until_complete(self.real_generate_image_with_progress(
+                result = self.run_async(self._generate(
                     prompt=prompt,
                     steps=self.steps_var.get(),
                     width=width,
-                    height=height
+                    height=height,
+                    progress=True
                 ))
                 
                 if result.get("success"):
@@ -1412,74 +1641,45 @@ class SDMCPTester:
             except Exception as e:
                 self.log_message(f"❌ Generation error: {e}")
             finally:
-                loop.close()
+                self._last_gen_done.set()
         
         threading.Thread(target=run_generation, daemon=True).start()
     
+    def after_generation(self, callback):
+        """Run callback in the main thread once the current generation finishes"""
+        if self._last_gen_done.is_set():
+            callback()
+        else:
+            self.root.after(100, self.after_generation, callback)
+    
     async def real_generate_image(self, prompt: str, steps: int, width: int, height: int):
         """Real image generation using SD client"""
-        try:
-            if not self.sd_client:
-                return {"success": False, "error": "SD Client not initialized"}
-            
-            # Create generation parameters
-            params = GenerateImageInput(
-                prompt=prompt,
-                negative_prompt="blurry, low quality, watermark",
-                steps=steps,
-                width=width,
-                height=height,
-                cfg_scale=7.0,
-                sampler_name="Euler",
-                seed=-1,
-                batch_size=1,
-                output_path=self.config.get("IMAGE_OUT_PATH", "/tmp/images")
-            )
-            
-            self.log_message(f"🎨 Generating with SD WebUI: {prompt[:50]}...")
-            
-            # Generate image
-            results = await self.sd_client.generate_image(params)
-            
-            if results and len(results) > 0:
-                # Use the first result
-                result = results[0]
-                image_path = result.output_path
-                
-                if os.path.exists(image_path):
-                    return {"success": True, "image_path": image_path}
-                else:
-                    return {"success": False, "error": "Generated image file not found"}
-            else:
-                return {"success": False, "error": "No images generated"}
-            
-        except Exception as e:
-            # Fallback to mock generation if real generation fails
-            self.log_sd_message(f"⚠️  Real generation failed, using mock: {e}")
-            return await self.mock_generate_image(prompt, steps, width, height)
+        return await self._generate(prompt, steps, width, height, progress=False)
     
     async def mock_generate_image(self, prompt: str, steps: int, width: int, height: int):
         """Mock image generation fallback"""
         try:
             # Create a simple test image
-            from PIL import Image, ImageDraw, ImageFont
             
             img = Image.new('RGB', (width, height), color='lightblue')
             draw = ImageDraw.Draw(img)
             
             # Add text
-            try:
-                # Try to use default font
-                font = ImageFont.load_default()
-            except:
-                font = None
+            global _DEFAULT_FONT
+            if _DEFAULT_FONT is None:
+                try:
+                    # Try to use default font
+                    _DEFAULT_FONT = ImageFont.load_default()
+                except:
+                    pass
             
-            text = f"Test Image\n{prompt[:30]}\n{steps} steps\n{width}x{height}"
-            draw.text((10, 10), text, fill='black', font=font)
+            text = _MOCK_IMAGE_TEXT.format(prompt[:30], steps, width, height)
+            draw.text((10, 10), text, fill='black', font=_DEFAULT_FONT)
             
             # Save to temp file
-            temp_path = tempfile.mktemp(suffix='.png')
-            img.save(temp_path)
+            with tempfile.NamedTemporaryFile(suffix='.png', delete=False, dir=self._scratch_dir) as tf:
+                temp_path = tf.name
+                img.save(tf, 'PNG', compress_level=0)
             
             return {"success": True, "image_path": temp_path}
             
@@ -1488,6 +1688,10 @@ class SDMCPTester:
     
     async def real_generate_image_with_progress(self, prompt: str, steps: int, width: int, height: int):
         """Real image generation with progress monitoring"""
+        return await self._generate(prompt, steps, width, height, progress=True)
+    
+    async def _generate(self, prompt: str, steps: int, width: int, height: int, *, progress: bool = True):
+        """Generate an image with the SD client, optionally monitoring progress"""
         try:
             if not self.sd_client:
                 return {"success": False, "error": "SD Client not initialized"}
@@ -1495,32 +1699,28 @@ class SDMCPTester:
             # Create generation parameters
             params = GenerateImageInput(
                 prompt=prompt,
-                negative_prompt="blurry, low quality, watermark",
                 steps=steps,
                 width=width,
                 height=height,
-                cfg_scale=7.0,
-                sampler_name="Euler",
-                seed=-1,
-                batch_size=1,
-                output_path=self.config.get("IMAGE_OUT_PATH", "/tmp/images")
+                **self._gen_defaults
             )
             
             self.log_sd_message(f"🎨 Sending generation request to SD WebUI...")
             self.log_sd_message(f"📝 Prompt: {prompt}")
             
             # Start generation (non-blocking)
-            import asyncio
             generation_task = asyncio.create_task(self.sd_client.generate_image(params))
             
             # Monitor progress while generation is running
-            progress_task = asyncio.create_task(self.monitor_generation_progress())
+            progress_task = asyncio.create_task(self.monitor_generation_progress()) if progress else None
             
             # Wait for generation to complete
-            results = await generation_task
-            
-            # Cancel progress monitoring
-            progress_task.cancel()
+            try:
+                results = await generation_task
+            finally:
+                # Cancel progress monitoring, even if generation failed
+                if progress_task:
+                    progress_task.cancel()
             
             self.log_sd_message(f"📎 Generation request completed")
             
@@ -1532,13 +1732,14 @@ class SDMCPTester:
                 self.log_sd_message(f"🖼️ Generated image saved to: {image_path}")
                 
                 # SD client already handles remote/local properly
-                if os.path.exists(image_path):
-                    file_size = os.path.getsize(image_path)
-                    self.log_sd_message(f"✅ Image file verified ({file_size} bytes)")
-                    return {"success": True, "image_path": image_path}
-                else:
+                try:
+                    st = os.stat(image_path)
+                except FileNotFoundError:
                     self.log_sd_message(f"❌ Image file not found at: {image_path}")
                     return {"success": False, "error": f"Generated image file not found at {image_path}"}
+                
+                self.log_sd_message(f"✅ Image file verified ({st.st_size} bytes)")
+                return {"success": True, "image_path": image_path}
             else:
                 self.log_sd_message("❌ SD WebUI returned empty results")
                 return {"success": False, "error": "No images generated by SD WebUI"}
@@ -1548,84 +1749,222 @@ class SDMCPTester:
             self.log_sd_message(f"⚠️  Real generation failed, using mock: {e}")
             return await self.mock_generate_image(prompt, steps, width, height)
     
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Get the persistent async client (base URL: SD WebUI) for polling and tests"""
+        # Always called on the shared background loop, so the client can live for the app
+        if self._httpx is None:
+            self._httpx = httpx.AsyncClient(
+                timeout=5,
+                base_url=self.config.get("SD_BASE_URL", "http://localhost:7860")
+            )
+        return self._httpx
+    
+    def _close_async_client(self):
+        """Close the persistent async client on the background loop and forget it"""
+        client, self._httpx = self._httpx, None
+        if client is None:
+            return None
+        return asyncio.run_coroutine_threadsafe(client.aclose(), self._bg_loop)
+    
     async def monitor_generation_progress(self):
         """Monitor SD WebUI generation progress using /sdapi/v1/progress endpoint"""
         try:
-            base_url = self.config.get("SD_BASE_URL", "http://localhost:7860")
+            # Reuse one keep-alive connection for every poll
+            client = self._get_async_client()
+            log = self.log_sd_message
+            sleep = asyncio.sleep
+            last_progress = -1
             
-            async with httpx.AsyncClient(timeout=5) as client:
-                last_progress = -1
-                
-                while True:
-                    try:
-                        # Check progress
-                        response = await client.get(f"{base_url}/sdapi/v1/progress")
+            while True:
+                try:
+                    # Check progress
+                    response = await client.get("/sdapi/v1/progress")
+                    
+                    if response.status_code == 200:
+                        progress_data = response.json()
+                        current_progress = progress_data.get("progress", 0)
                         
-                        if response.status_code == 200:
-                            progress_data = response.json()
-                            current_progress = progress_data.get("progress", 0)
+                        # Only log if progress changed significantly
+                        if current_progress != last_progress and current_progress > 0:
+                            progress_percent = int(current_progress * 100)
+                            eta = progress_data.get("eta_relative", 0)
                             
-                            # Only log if progress changed significantly
-                            if current_progress != last_progress and current_progress > 0:
-                                progress_percent = int(current_progress * 100)
-                                eta = progress_data.get("eta_relative", 0)
-                                
-                                if eta > 0:
-                                    self.log_sd_message(f"🔄 Generation progress: {progress_percent}% (ETA: {eta:.1f}s)")
-                                else:
-                                    self.log_sd_message(f"🔄 Generation progress: {progress_percent}%")
-                                
-                                last_progress = current_progress
+                            if eta > 0:
+                                log(f"🔄 Generation progress: {progress_percent}% (ETA: {eta:.1f}s)")
+                            else:
+                                log(f"🔄 Generation progress: {progress_percent}%")
                             
-                            # If progress reaches 100%, generation is done
-                            if current_progress >= 1.0:
-                                self.log_sd_message("🏁 Generation completed!")
-                                break
-                                
-                        # Wait a bit before checking again
-                        await asyncio.sleep(1)
-                        
-                    except asyncio.CancelledError:
-                        # Progress monitoring was cancelled (generation finished)
-                        break
-                    except httpx.RequestError:
-                        # Progress endpoint might not be available, just break
-                        break
-                    except Exception:
-                        # Any other error, just continue without progress monitoring
-                        break
+                            last_progress = current_progress
                         
+                        # If progress reaches 100%, generation is done
+                        if current_progress >= 1.0:
+                            log("🏁 Generation completed!")
+                            break
+                            
+                    # Wait a bit before checking again
+                    await sleep(1)
+                    
+                except asyncio.CancelledError:
+                    # Progress monitoring was cancelled (generation finished)
+                    break
+                except httpx.RequestError:
+                    # Progress endpoint might not be available, just break
+                    break
+                except Exception:
+                    # Any other error, just continue without progress monitoring
+                    break
+                    
         except Exception:
             # Progress monitoring failed, but don't stop generation
             pass
     
     
-    def display_image_safe(self, image_path: str, label_key: str):
+    def display_image_safe(self, image_path: Union[str, os.PathLike], label_key: str):
         """Safely display image by scheduling it in the main thread"""
-        def _display():
+        # Only the latest image per label is shown; earlier pending ones are dropped
+        with self._display_lock:
+            self._pending_display[label_key] = image_path
+            
+            # Schedule in main thread
+            if self._display_scheduled:
+                return
+            self._display_scheduled = True
+        self.root.after_idle(self._flush_displays)
+    
+    def _flush_displays(self):
+        """Display the latest pending image for each label"""
+        with self._display_lock:
+            pending = self._pending_display
+            self._pending_display = {}
+            self._display_scheduled = False
+        
+        for label_key, image_path in pending.items():
             self.display_image(image_path, label_key)
+    
+    def _create_photo(self, img, method: str):
+        """Create a Tk photo image from a PIL image using the given method"""
+        match method:
+            case 'direct':
+                return ImageTk.PhotoImage(img)
+            case 'buffer':
+                # Round-trip through PNG in memory
+                buf = self._reset_scratch_buf()
+                img.save(buf, 'PNG')
+                buf.seek(0)
+                with Image.open(buf) as buf_img:
+                    return ImageTk.PhotoImage(buf_img)
+            case 'b64':
+                # Convert to PNG bytes and load them with tk.PhotoImage
+                img_bytes = io.BytesIO()
+                img.save(img_bytes, format='PNG')
+                if _TK_RAW_PNG:
+                    return tk.PhotoImage(data=img_bytes.getvalue(), format='png')
+                
+                # Older Tk only accepts base64 encoded data
+                img_b64 = base64.b64encode(img_bytes.getvalue()).decode('utf-8')
+                return tk.PhotoImage(data=img_b64)
+            case 'jpeg':
+                # Convert to JPEG and back in memory
+                buf = self._reset_scratch_buf()
+                img.convert('RGB').save(buf, 'JPEG', quality=95)
+                buf.seek(0)
+                with Image.open(buf) as jpeg_img:
+                    return ImageTk.PhotoImage(jpeg_img)
+        return None
+    
+    def _reset_scratch_buf(self) -> io.BytesIO:
+        """Rewind and clear the reusable in-memory image buffer"""
+        self._scratch_buf.seek(0)
+        self._scratch_buf.truncate()
+        return self._scratch_buf
+    
+    def _detect_photo_method(self) -> str:
+        """Probe once which PhotoImage creation method works with this Tk/PIL install"""
+        probe = Image.new('RGB', (1, 1))
         
-        # Schedule in main thread
-        self.root.after(0, _display)
+        for method in _PHOTO_METHODS:
+            try:
+                if self._create_photo(probe, method) is not None:
+                    self._photo_method = method
+                    break
+            except Exception as e:
+                self.log_sd_message(f"❌ PhotoImage method '{method}' failed: {e}")
+        else:
+            self._photo_method = 'text'
+            self.log_sd_message(f"❌ All PhotoImage methods failed!")
+            self.log_sd_message(f"🔍 Tkinter version info: {tk.TkVersion}")
+            self.log_sd_message(f"🔍 PIL version info: {Image.__version__ if hasattr(Image, '__version__') else 'Unknown'}")
+        
+        if self.debug_display:
+            self.log_sd_message(f"🔍 Using PhotoImage method: {self._photo_method}")
+        return self._photo_method
+    
+    def _create_photo_with_fallback(self, img):
+        """Create a PhotoImage, moving on to the next method when the current one fails"""
+        start = _PHOTO_METHODS.index(self._photo_method)
+        for method in _PHOTO_METHODS[start:]:
+            try:
+                photo = self._create_photo(img, method)
+            except Exception as e:
+                self.log_sd_message(f"❌ PhotoImage creation failed ({method}): {e}")
+                continue
+            if photo is not None:
+                if method != self._photo_method:
+                    # Demote so later images start with the method that worked
+                    self.log_sd_message(f"🔍 Switching PhotoImage method: {self._photo_method} → {method}")
+                    self._photo_method = method
+                return photo
+        
+        self._photo_method = 'text'
+        return None
+    
+    def _show_image_text_fallback(self, img, label_key: str, original_size):
+        """Show file path instead of the image and save a copy for manual viewing"""
+        try:
+            fallback_dir = Path.home() / "Desktop" / "sd_gui_images"
+            fallback_dir.mkdir(exist_ok=True)
+            fallback_path = fallback_dir / f"sd_image_{datetime.now().strftime('%H%M%S')}.png"
+            img.save(fallback_path, 'PNG')
+            
+            # Update label with text instead of image
+            if label_key in self.image_labels:
+                self.image_labels[label_key].configure(
+                    text=f"Image generated successfully!\n\n{original_size[0]}x{original_size[1]} pixels\n\nSaved to:\n{fallback_path}\n\n(PIL/Tkinter display issue)",
+                    image="",
+                    compound=tk.TOP,
+                    justify=tk.CENTER,
+                    wraplength=300
+                )
+                self.image_labels[label_key].image = None
+            
+            self.log_sd_message(f"📁 Fallback: Image saved to {fallback_path}")
+            self.log_sd_message(f"⚠️ PIL/Tkinter compatibility issue - showing text instead")
+            
+        except Exception as e:
+            self.log_sd_message(f"❌ Even fallback method failed: {e}")
     
-    def display_image(self, image_path: str, label_key: str):
+    def display_image(self, image_path: Union[str, os.PathLike], label_key: str):
         """Display image in the specified label"""
+        log = self.log_sd_message
         try:
-            if not os.path.exists(image_path):
-                self.log_sd_message(f"❌ Image file not found: {image_path}")
+            try:
+                st = os.stat(image_path)
+            except FileNotFoundError:
+                log(f"❌ Image file not found: {image_path}")
                 return
             
             # Check file size
-            file_size = os.path.getsize(image_path)
+            file_size = st.st_size
             if file_size == 0:
-                self.log_sd_message(f"❌ Image file is empty: {image_path}")
+                log(f"❌ Image file is empty: {image_path}")
                 return
                 
-            self.log_sd_message(f"🖼️ Loading image: {os.path.basename(image_path)} ({file_size} bytes)")
+            log(f"🖼️ Loading image: {os.path.basename(image_path)} ({file_size} bytes)")
                 
             # Load and validate image with detailed debugging
             try:
-                self.log_sd_message(f"🔍 Opening image with PIL...")
+                if self.debug_display:
+                    log(f"🔍 Opening image with PIL...")
                 img = Image.open(image_path)
                 
                 # Get detailed image info before verify
@@ -1633,206 +1972,117 @@ class SDMCPTester:
                 original_mode = img.mode
                 original_format = img.format
                 
-                self.log_sd_message(f"🔍 Original image: {original_size}, mode={original_mode}, format={original_format}")
+                if self.debug_display:
+                    log(f"🔍 Original image: {original_size}, mode={original_mode}, format={original_format}")
                 
-                # Verify the image is valid
-                img.verify()
-                self.log_sd_message(f"✅ Image verification passed")
+                # Verification re-reads the whole file, so it is opt-in (SD output is trusted)
+                if self.config.get("VERIFY_IMAGES", False):
+                    img.verify()
+                    log(f"✅ Image verification passed")
+                    
+                    # Reopen image after verify (verify closes it)
+                    img = Image.open(image_path)
                 
-                # Reopen image after verify (verify closes it)
-                img = Image.open(image_path)
-                
-                # Check if conversion is needed
-                if img.mode not in ('RGB', 'L'):
-                    self.log_sd_message(f"🔄 Converting from {img.mode} to RGB")
-                    img = img.convert('RGB')
-                else:
-                    self.log_sd_message(f"✅ Image mode {img.mode} is compatible")
+                # Let the decoder downscale while decoding (JPEG only, no-op for PNG)
+                img.draft('RGB', (400, 400))
                 
             except Exception as e:
-                self.log_sd_message(f"❌ PIL image loading failed: {e}")
-                import traceback
-                self.log_sd_message(f"🔍 PIL error traceback: {traceback.format_exc()}")
+                log(f"❌ PIL image loading failed: {e}")
+                if self.debug_display:
+                    log(f"🔍 PIL error traceback: {traceback.format_exc()}")
                 return
             
             # Resize to fit display (max 400x400 for better viewing)
-            self.log_sd_message(f"🔄 Resizing image from {img.size}...")
-            img.thumbnail((400, 400), Image.Resampling.LANCZOS)
+            if self.debug_display:
+                log(f"🔄 Resizing image from {img.size}...")
+            img.thumbnail((400, 400), Image.Resampling.BILINEAR)
             display_size = img.size
-            self.log_sd_message(f"✅ Resized to {display_size}")
-            
-            # Try multiple PhotoImage creation methods
-            photo = None
+            if self.debug_display:
+                log(f"✅ Resized to {display_size}")
+            
+            # Convert after resizing so only the thumbnail's pixels are touched
+            if img.mode not in ('RGB', 'L'):
+                if self.debug_display:
+                    log(f"🔄 Converting from {img.mode} to RGB")
+                img = img.convert('RGB')
+            elif self.debug_display:
+                log(f"✅ Image mode {img.mode} is compatible")
+            
+            # Create the PhotoImage with the method that works on this install
+            if self._photo_method is None:
+                self._detect_photo_method()
+            
+            if self._photo_method == 'text':
+                self._show_image_text_fallback(img, label_key, original_size)
+                return
             
-            # Method 1: Direct PhotoImage creation with extensive debugging
             try:
-                self.log_sd_message(f"🔍 Attempting direct PhotoImage creation...")
-                
-                # Debug Tkinter state
-                self.log_sd_message(f"🔍 Root window exists: {self.root is not None}")
-                if self.root:
-                    self.log_sd_message(f"🔍 Root window active: {self.root.winfo_exists()}")
-                    self.log_sd_message(f"🔍 Root window class: {self.root.__class__}")
-                
-                # Debug threading
-                import threading
-                self.log_sd_message(f"🔍 Current thread: {threading.current_thread().name}")
-                self.log_sd_message(f"🔍 Main thread: {threading.main_thread().name}")
-                
-                # Debug PIL image
-                self.log_sd_message(f"🔍 PIL Image type: {type(img)}")
-                self.log_sd_message(f"🔍 PIL Image mode: {img.mode}")
-                self.log_sd_message(f"🔍 PIL Image size: {img.size}")
-                
-                # Ensure we're working with the main thread and root window exists
                 if not self.root or not self.root.winfo_exists():
                     raise RuntimeError("Root window not available")
-                
-                # Force GUI update to ensure root is properly initialized
-                self.root.update_idletasks()
-                
-                # Try creating PhotoImage with more debugging
-                self.log_sd_message(f"🔍 About to create ImageTk.PhotoImage...")
-                photo = ImageTk.PhotoImage(img)
-                self.log_sd_message(f"✅ Direct PhotoImage creation succeeded")
             except Exception as e:
-                self.log_sd_message(f"❌ Direct PhotoImage failed: {e}")
-                
-                # Method 2: Save to temp file and load from path
-                try:
-                    self.log_sd_message(f"🔍 Trying temp file method...")
-                    temp_path = tempfile.mktemp(suffix='.png')
-                    img.save(temp_path, 'PNG')
-                    self.log_sd_message(f"🔍 Saved temp image to {temp_path}")
-                    
-                    # Use ImageTk.PhotoImage for better compatibility
-                    temp_img = Image.open(temp_path)
-                    photo = ImageTk.PhotoImage(temp_img)
-                    self.log_sd_message(f"✅ Temp file PhotoImage creation succeeded")
-                    
-                    # Clean up temp file
-                    os.unlink(temp_path)
-                    
-                except Exception as e2:
-                    self.log_sd_message(f"❌ Temp file PhotoImage failed: {e2}")
-                    
-                    # Method 3: Convert to bytes and use tk.PhotoImage with base64
-                    try:
-                        self.log_sd_message(f"🔍 Trying base64 tk.PhotoImage method...")
-                        import io
-                        import base64
-                        
-                        # Save image to bytes as PNG
-                        img_bytes = io.BytesIO()
-                        img.save(img_bytes, format='PNG')
-                        img_bytes.seek(0)
-                        
-                        # Convert to base64
-                        img_b64 = base64.b64encode(img_bytes.getvalue()).decode('utf-8')
-                        
-                        # Use tk.PhotoImage with base64 data (might work better than ImageTk)
-                        photo = tk.PhotoImage(data=img_b64)
-                        self.log_sd_message(f"✅ Base64 tk.PhotoImage creation succeeded")
-                        
-                    except Exception as e3:
-                        self.log_sd_message(f"❌ Bytes data PhotoImage failed: {e3}")
-                        
-                        # Method 4: Try with different image formats
-                        try:
-                            self.log_sd_message(f"🔍 Trying JPEG conversion method...")
-                            # Convert to JPEG and back to see if that helps
-                            temp_jpeg = tempfile.mktemp(suffix='.jpg')
-                            img.convert('RGB').save(temp_jpeg, 'JPEG', quality=95)
-                            
-                            # Reload as JPEG
-                            jpeg_img = Image.open(temp_jpeg)
-                            photo = ImageTk.PhotoImage(jpeg_img)
-                            self.log_sd_message(f"✅ JPEG conversion method succeeded")
-                            
-                            # Clean up
-                            os.unlink(temp_jpeg)
-                            jpeg_img.close()
-                            
-                        except Exception as e4:
-                            self.log_sd_message(f"❌ All PhotoImage methods failed!")
-                            self.log_sd_message(f"🔍 Final error: {e4}")
-                            self.log_sd_message(f"🔍 Tkinter version info: {tk.TkVersion}")
-                            self.log_sd_message(f"🔍 PIL version info: {Image.__version__ if hasattr(Image, '__version__') else 'Unknown'}")
-                            
-                            # Method 5: Fallback - Just show file path and save a copy for manual viewing
-                            try:
-                                self.log_sd_message(f"🔍 Trying fallback method - text display...")
-                                
-                                # Save a copy of the image for manual viewing
-                                fallback_dir = Path.home() / "Desktop" / "sd_gui_images"
-                                fallback_dir.mkdir(exist_ok=True)
-                                fallback_path = fallback_dir / f"sd_image_{datetime.now().strftime('%H%M%S')}.png"
-                                img.save(fallback_path, 'PNG')
-                                
-                                # Update label with text instead of image
-                                if label_key in self.image_labels:
-                                    self.image_labels[label_key].configure(
-                                        text=f"Image generated successfully!\n\n{original_size[0]}x{original_size[1]} pixels\n\nSaved to:\n{fallback_path}\n\n(PIL/Tkinter display issue)",
-                                        image="",
-                                        compound=tk.TOP,
-                                        justify=tk.CENTER,
-                                        wraplength=300
-                                    )
-                                    self.image_labels[label_key].image = None
-                                
-                                self.log_sd_message(f"📁 Fallback: Image saved to {fallback_path}")
-                                self.log_sd_message(f"⚠️ PIL/Tkinter compatibility issue - showing text instead")
-                                return
-                                
-                            except Exception as e5:
-                                self.log_sd_message(f"❌ Even fallback method failed: {e5}")
-                                return
-            
-            if not photo:
-                self.log_sd_message(f"❌ No PhotoImage created despite trying all methods")
+                log(f"❌ PhotoImage creation failed ({self._photo_method}): {e}")
                 return
             
+            # Paste into this label's previous PhotoImage when the size matches
+            photo = self._photo_cache.get(label_key)
+            if photo is not None and (photo.width(), photo.height()) == img.size:
+                try:
+                    photo.paste(img)
+                except Exception as e:
+                    log(f"❌ PhotoImage paste failed: {e}")
+                    photo = None
+            else:
+                photo = None
+            
+            if photo is None:
+                photo = self._create_photo_with_fallback(img)
+                if photo is None:
+                    # Every method failed on this image; save a copy and show its path
+                    self._show_image_text_fallback(img, label_key, original_size)
+                    return
+                if isinstance(photo, ImageTk.PhotoImage):
+                    self._photo_cache[label_key] = photo
+            
             # Update label with comprehensive error handling
             if label_key in self.image_labels:
                 try:
-                    self.log_sd_message(f"🔍 Updating label widget...")
                     label_widget = self.image_labels[label_key]
                     
                     # Check widget state
-                    self.log_sd_message(f"🔍 Label widget type: {type(label_widget)}")
-                    self.log_sd_message(f"🔍 Label widget exists: {label_widget.winfo_exists()}")
+                    if self.debug_display:
+                        log(f"🔍 Label widget type: {type(label_widget)}")
+                        log(f"🔍 Label widget exists: {label_widget.winfo_exists()}")
                     
                     # Update the label
                     label_widget.configure(image=photo, text="")
                     label_widget.image = photo  # Keep reference
                     
-                    self.log_sd_message(f"✅ Image displayed successfully: {original_size[0]}x{original_size[1]} → {display_size[0]}x{display_size[1]}")
-                    
-                    # Force GUI update
-                    self.root.update_idletasks()
+                    log(f"✅ Image displayed successfully: {original_size[0]}x{original_size[1]} → {display_size[0]}x{display_size[1]}")
                     
                 except Exception as e:
-                    self.log_sd_message(f"❌ Failed to update image label: {e}")
-                    import traceback
-                    self.log_sd_message(f"🔍 Label update error: {traceback.format_exc()}")
+                    log(f"❌ Failed to update image label: {e}")
+                    if self.debug_display:
+                        log(f"🔍 Label update error: {traceback.format_exc()}")
             else:
-                self.log_sd_message(f"❌ Image label '{label_key}' not found")
-                # Show available image labels for debugging
-                available_labels = list(self.image_labels.keys())
-                self.log_sd_message(f"🔍 Available image labels: {available_labels}")
-                
-                # Try to find similar label keys
-                for key in available_labels:
-                    if label_key.lower() in key.lower() or key.lower() in label_key.lower():
-                        self.log_sd_message(f"🔍 Similar key found: {key}")
+                log(f"❌ Image label '{label_key}' not found")
+                if self.debug_display:
+                    # Show available image labels for debugging
+                    available_labels = list(self.image_labels.keys())
+                    log(f"🔍 Available image labels: {available_labels}")
+                    
+                    # Try to find similar label keys
+                    for key in available_labels:
+                        if label_key.lower() in key.lower() or key.lower() in label_key.lower():
+                            log(f"🔍 Similar key found: {key}")
                 
         except Exception as e:
-            self.log_sd_message(f"❌ Critical error in display_image: {e}")
-            self.log_sd_message(f"🔍 Image path: {image_path}")
-            self.log_sd_message(f"🔍 Label key: {label_key}")
-            self.log_sd_message(f"🔍 Python version: {sys.version}")
-            import traceback
-            self.log_sd_message(f"🔍 Full traceback: {traceback.format_exc()}")
+            log(f"❌ Critical error in display_image: {e}")
+            if self.debug_display:
+                log(f"🔍 Image path: {image_path}")
+                log(f"🔍 Label key: {label_key}")
+                log(f"🔍 Python version: {sys.version}")
+            if self.debug_display:
+                log(f"🔍 Full traceback: {traceback.format_exc()}")
             
             # Emergency fallback: show file path in label
             try:
@@ -1858,7 +2108,7 @@ class SDMCPTester:
     
     def import_from_sd_testing(self):
         """Import the last generated image from SD testing"""
-        if not self.last_sd_image or not Path(self.last_sd_image).exists():
+        if not self.last_sd_image or not os.path.exists(self.last_sd_image):
             messagebox.showwarning("No Image", "No recent SD image available to import. Generate an image in SD Testing first.")
             return
         
@@ -1881,7 +2131,7 @@ class SDMCPTester:
         # Generate the image (this logs to SD tab)
         self.generate_test_image()
         
-        # Schedule a switch back to NudeNet tab after a delay
+        # Schedule a switch back to NudeNet tab once generation is done
         def switch_back_and_import():
             if self.last_sd_image and Path(self.last_sd_image).exists():
                 # Switch back to NudeNet tab
@@ -1892,8 +2142,8 @@ class SDMCPTester:
             else:
                 self.log_nudenet_message("❌ Failed to generate test image")
         
-        # Give the generation some time to complete
-        self.root.after(3000, switch_back_and_import)
+        # Import as soon as the generation completes
+        self.after_generation(switch_back_and_import)
     
     def generate_safe_test(self):
         """Generate safe test image for NudeNet testing"""
@@ -1910,7 +2160,7 @@ class SDMCPTester:
         # Generate the image (this logs to SD tab)
         self.generate_test_image()
         
-        # Schedule a switch back to NudeNet tab after a delay
+        # Schedule a switch back to NudeNet tab once generation is done
         def switch_back_and_import():
             if self.last_sd_image and Path(self.last_sd_image).exists():
                 # Switch back to NudeNet tab
@@ -1921,8 +2171,14 @@ class SDMCPTester:
             else:
                 self.log_nudenet_message("❌ Failed to generate test image")
         
-        # Give the generation some time to complete
-        self.root.after(3000, switch_back_and_import)
+        # Import as soon as the generation completes
+        self.after_generation(switch_back_and_import)
+    
+    def _clear_image_slot(self, label_key: str, text: str):
+        """Replace an image label's picture with placeholder text"""
+        if label_key in self.image_labels:
+            self.image_labels[label_key].configure(text=text, image="")
+            self.image_labels[label_key].image = None
     
     def test_nudenet(self):
         """Test NudeNet filtering on current image"""
@@ -1934,9 +2190,6 @@ class SDMCPTester:
         self.log_nudenet_message("🔍 Testing NudeNet filtering...")
         
         def run_test():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
             try:
                 if not self.sd_client:
                     self.log_nudenet_message("❌ SD Client not initialized")
@@ -1950,124 +2203,124 @@ class SDMCPTester:
                 
                 # Run real NudeNet censoring
                 self.log_nudenet_message(f"🔍 Running NudeNet analysis on: {Path(image_path).name}")
-                result = loop.run_until_complete(
+                result = self.run_async(
                     self.sd_client.nudenet_censor(image_path, save_original=True)
                 )
                 self.log_nudenet_message(f"✅ NudeNet analysis completed")
                 
-                detection_results = {
-                    "success": result.get("success", False),
-                    "nudity_detected": result.get("has_nsfw", False),
-                    "original_path": result.get("original_image"),
-                    "censored_path": result.get("censored_image"),
-                    "mask_path": result.get("detection_mask"),
-                    "detection_classes": result.get("detection_classes", []),
-                    "confidence_scores": result.get("confidence_scores", []),
-                    "error": result.get("error")
-                }
+                success = result.get("success", False)
+                nudity_detected = result.get("has_nsfw", False)
+                # Output paths as Path objects, built once and reused below
+                original_path = Path(p) if (p := result.get("original_image")) else None
+                censored_path = Path(p) if (p := result.get("censored_image")) else None
+                mask_path = Path(p) if (p := result.get("detection_mask")) else None
+                classes = result.get("detection_classes", [])
+                scores = result.get("confidence_scores", [])
+                error = result.get("error")
                 
                 # Log detailed results 
-                self.log_nudenet_message(f"📊 Success: {detection_results['success']}")
-                self.log_nudenet_message(f"🔍 NSFW Detected: {detection_results['nudity_detected']}")
+                self.log_nudenet_message(f"📊 Success: {success}")
+                self.log_nudenet_message(f"🔍 NSFW Detected: {nudity_detected}")
                 
-                if detection_results.get('detection_classes'):
-                    classes_str = ", ".join(detection_results['detection_classes'])
+                if classes:
+                    classes_str = ", ".join(classes)
                     self.log_nudenet_message(f"🏷️  Detected classes: {classes_str}")
                 
-                if detection_results.get('confidence_scores'):
-                    max_confidence = max(detection_results['confidence_scores']) if detection_results['confidence_scores'] else 0
+                # Find the max confidence and format the scores in one pass
+                max_confidence = 0.0
+                formatted_scores = []
+                for score in scores:
+                    if score > max_confidence:
+                        max_confidence = score
+                    formatted_scores.append(f"{score:.3f}")
+                
+                if scores:
                     self.log_nudenet_message(f"📈 Max confidence: {max_confidence:.3f}")
                 
                 # Display detailed results in text area
-                results_text = f"""NudeNet Detection Results:
-=========================
-
-Success: {detection_results['success']}
-NSFW Detected: {detection_results['nudity_detected']}
-
-Detection Details:
-"""
-                
-                if detection_results.get('detection_classes'):
-                    results_text += f"  Classes: {', '.join(detection_results['detection_classes'])}\n"
-                if detection_results.get('confidence_scores'):
-                    results_text += f"  Confidences: {[f'{s:.3f}' for s in detection_results['confidence_scores']]}\n"
-                
-                results_text += "\nPaths:\n"
-                if detection_results.get('original_path'):
-                    results_text += f"  Original: {detection_results['original_path']}\n"
-                if detection_results.get('censored_path'):
-                    results_text += f"  Censored: {detection_results['censored_path']}\n"
-                if detection_results.get('mask_path'):
-                    results_text += f"  Mask: {detection_results['mask_path']}\n"
-                
-                if detection_results.get('error'):
-                    results_text += f"\nError: {detection_results['error']}\n"
-                
-                results_text += "\nConfiguration:\n"
-                results_text += f"  Using MCP.json settings\n"
+                lines = [
+                    "NudeNet Detection Results:",
+                    "=" * 25,
+                    "",
+                    f"Success: {success}",
+                    f"NSFW Detected: {nudity_detected}",
+                    "",
+                    "Detection Details:"
+                ]
+                
+                if classes:
+                    lines.append(f"  Classes: {', '.join(classes)}")
+                if scores:
+                    lines.append(f"  Confidences: {', '.join(formatted_scores)}")
+                
+                lines += ["", "Paths:"]
+                if original_path:
+                    lines.append(f"  Original: {original_path}")
+                if censored_path:
+                    lines.append(f"  Censored: {censored_path}")
+                if mask_path:
+                    lines.append(f"  Mask: {mask_path}")
+                
+                if error:
+                    lines += ["", f"Error: {error}"]
+                
+                lines += ["", "Configuration:", "  Using MCP.json settings"]
                 if current_config:
-                    results_text += f"  Config loaded: {len(current_config)} settings\n"
+                    lines.append(f"  Config loaded: {len(current_config)} settings")
                 
-                self.detection_text.delete("1.0", tk.END)
-                self.detection_text.insert("1.0", results_text)
+                # Progress lines logged so far are replaced by the report, on the Tk thread
+                self.root.after_idle(self._replace_nudenet_log, "\n".join(lines) + "\n",
+                                     next(self._nudenet_log_seq))
                 
                 # Display all available images using safe display method
                 images_displayed = 0
                 
-                # Always show the original (input) image
-                if detection_results.get('original_path') and os.path.exists(detection_results['original_path']):
-                    self.display_image_safe(detection_results['original_path'], "before")
-                    self.log_nudenet_message(f"🖼️ Original image displayed")
-                    images_displayed += 1
-                elif os.path.exists(image_path):
-                    # Fallback to input image if original not saved
-                    self.display_image_safe(image_path, "before")
-                    self.log_nudenet_message(f"🖼️ Input image displayed")
-                    images_displayed += 1
-                
-                # Show filtered/censored result
-                if detection_results.get('censored_path') and os.path.exists(detection_results['censored_path']):
-                    self.display_image_safe(detection_results['censored_path'], "after")
-                    self.log_nudenet_message("⚠️ NSFW content detected - censored image displayed")
-                    images_displayed += 1
-                elif detection_results['success'] and not detection_results['nudity_detected']:
-                    # No nudity detected, show original in 'after' slot
-                    self.display_image_safe(image_path, "after")
-                    self.log_nudenet_message("✅ No NSFW content detected - original displayed")
-                    images_displayed += 1
-                else:
-                    # Clear the after image slot if no result
-                    if "after" in self.image_labels:
-                        self.image_labels["after"].configure(text="No filtered image\n(detection failed)", image="")
-                        self.image_labels["after"].image = None
-                
-                # Show detection mask if available
-                if detection_results.get('mask_path') and os.path.exists(detection_results['mask_path']):
-                    self.display_image_safe(detection_results['mask_path'], "mask")
-                    self.log_nudenet_message(f"🎭 Detection mask displayed")
-                    images_displayed += 1
-                else:
-                    # Clear the mask slot if no mask
-                    if "mask" in self.image_labels:
-                        self.image_labels["mask"].configure(text="No detection mask\n(no NSFW detected)", image="")
-                        self.image_labels["mask"].image = None
+                # Check each output path once
+                orig_exists = original_path is not None and original_path.is_file()
+                censored_exists = censored_path is not None and censored_path.is_file()
+                mask_exists = mask_path is not None and mask_path.is_file()
+                
+                # The input image is only needed when the original wasn't saved
+                input_exists = orig_exists or Path(image_path).is_file()
+                clean = success and not nudity_detected
+                
+                # Each slot: candidate (path, usable, log message) in priority order,
+                # and the placeholder shown when none is usable
+                slots = [
+                    ("before", [
+                        (original_path, orig_exists, "🖼️ Original image displayed"),
+                        (image_path, input_exists, "🖼️ Input image displayed")
+                    ], None),
+                    ("after", [
+                        (censored_path, censored_exists, "⚠️ NSFW content detected - censored image displayed"),
+                        (image_path, clean, "✅ No NSFW content detected - original displayed")
+                    ], "No filtered image\n(detection failed)"),
+                    ("mask", [
+                        (mask_path, mask_exists, "🎭 Detection mask displayed")
+                    ], "No detection mask\n(no NSFW detected)")
+                ]
+                
+                for slot, candidates, placeholder in slots:
+                    chosen = next(((path, message) for path, usable, message in candidates if usable), None)
+                    if chosen:
+                        self.display_image_safe(chosen[0], slot)
+                        self.log_nudenet_message(chosen[1])
+                        images_displayed += 1
+                    elif placeholder:
+                        self.root.after_idle(self._clear_image_slot, slot, placeholder)
                 
                 # Summary
-                if detection_results['success']:
-                    if detection_results['nudity_detected']:
+                if success:
+                    if nudity_detected:
                         self.log_nudenet_message(f"🔍 Analysis complete: NSFW detected ({images_displayed} images displayed)")
                     else:
                         self.log_nudenet_message(f"🔍 Analysis complete: Clean image ({images_displayed} images displayed)")
                 else:
-                    self.log_nudenet_message(f"❌ NudeNet analysis failed: {detection_results.get('error', 'Unknown error')}")
+                    self.log_nudenet_message(f"❌ NudeNet analysis failed: {error or 'Unknown error'}")
                     
             except Exception as e:
                 self.log_nudenet_message(f"❌ NudeNet test failed: {e}")
-                import traceback
                 self.log_nudenet_message(f"🔍 Error details: {traceback.format_exc()}")
-            finally:
-                loop.close()
         
         threading.Thread(target=run_test, daemon=True).start()
     
@@ -2077,10 +2330,9 @@ Detection Details:
         params = self.mcp_tool_params.get(tool_name, {}).copy()
         
         # Update tool description
-        for tool_id, description in self.mcp_tools:
-            if tool_id == tool_name:
-                self.tool_description.set(description)
-                break
+        description = self._mcp_tool_desc.get(tool_name)
+        if description is not None:
+            self.tool_description.set(description)
         
         # Update upload_image with last generated image if available
         if tool_name == "upload_image" and self.last_sd_image:
@@ -2089,7 +2341,7 @@ Detection Details:
         # Clear and update parameters
         self.mcp_params.delete("1.0", tk.END)
         if params:
-            params_json = json.dumps(params, indent=2)
+            params_json = _json_pretty(params)
             self.mcp_params.insert("1.0", params_json)
         else:
             self.mcp_params.insert("1.0", "{}")
@@ -2100,7 +2352,7 @@ Detection Details:
         
         try:
             params_text = self.mcp_params.get("1.0", tk.END).strip()
-            params = json.loads(params_text) if params_text else {}
+            params = _json_loads(params_text) if params_text else {}
         except json.JSONDecodeError as e:
             messagebox.showerror("Error", f"Invalid JSON parameters: {e}")
             return
@@ -2108,12 +2360,9 @@ Detection Details:
         self.log_message(f"🔧 Executing MCP tool: {tool_name}")
         
         def run_tool():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
             try:
                 # Call real MCP tool
-                result_data = loop.run_until_complete(self.call_real_mcp_tool(tool_name, params))
+                result_data = self.run_async(self.call_real_mcp_tool(tool_name, params))
                 
                 result = {
                     "tool": tool_name,
@@ -2128,9 +2377,7 @@ Detection Details:
                     result["success"] = False
                 
                 # Format and display results
-                formatted_result = json.dumps(result, indent=2, default=str)
-                self.mcp_results.delete("1.0", tk.END)
-                self.mcp_results.insert("1.0", formatted_result)
+                self._insert_json(self.mcp_results, result, default=str)
                 
                 if result["success"]:
                     self.log_message(f"✅ Tool {tool_name} executed successfully")
@@ -2147,34 +2394,43 @@ Detection Details:
                     "timestamp": datetime.now().isoformat()
                 }
                 
-                formatted_result = json.dumps(error_result, indent=2)
+                formatted_result = _json_pretty(error_result)
                 self.mcp_results.delete("1.0", tk.END)
                 self.mcp_results.insert("1.0", formatted_result)
-            finally:
-                loop.close()
         
         threading.Thread(target=run_tool, daemon=True).start()
     
+    def _insert_json(self, widget: tk.Text, obj, default=None):
+        """Replace a text widget's content with obj as JSON, inserted in chunks"""
+        widget.delete("1.0", tk.END)
+        
+        # Serialize once, then insert in slices so Tk never handles one huge string
+        text = _json_pretty(obj, default=default)
+        for start in range(0, len(text), _JSON_INSERT_CHUNK):
+            widget.insert(tk.END, text[start:start + _JSON_INSERT_CHUNK])
+    
     async def call_real_mcp_tool(self, tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Call real MCP tool functions"""
         try:
-            # Import MCP functions directly
-            from scripts.mcp_servers.sd_mcp_server import (
-                generate_image, get_models, load_checkpoint, get_current_model,
-                search_loras, get_queue_status, upload_image, start_guided_generation
-            )
-            
-            # Map tool names to functions
-            tool_functions = {
-                "generate_image": generate_image,
-                "get_models": get_models,
-                "load_checkpoint": load_checkpoint,
-                "get_current_model": get_current_model,
-                "search_loras": search_loras,
-                "get_queue_status": get_queue_status,
-                "upload_image": upload_image,
-                "start_guided_generation": start_guided_generation
-            }
+            # Import MCP functions directly (once, on first use)
+            if self._tool_functions is None:
+                from scripts.mcp_servers.sd_mcp_server import (
+                    generate_image, get_models, load_checkpoint, get_current_model,
+                    search_loras, get_queue_status, upload_image, start_guided_generation
+                )
+                
+                # Map tool names to functions
+                self._tool_functions = {
+                    "generate_image": generate_image,
+                    "get_models": get_models,
+                    "load_checkpoint": load_checkpoint,
+                    "get_current_model": get_current_model,
+                    "search_loras": search_loras,
+                    "get_queue_status": get_queue_status,
+                    "upload_image": upload_image,
+                    "start_guided_generation": start_guided_generation
+                }
+            tool_functions = self._tool_functions
             
             if tool_name not in tool_functions:
                 return {
@@ -2196,19 +2452,54 @@ Detection Details:
                 "suggestion": "Check parameters and SD WebUI connection"
             }
     
+    def _flush_upload_lines(self, lines: List[str]):
+        """Append buffered lines to the upload results in a single Tk update"""
+        if not lines:
+            return
+        text = "\n".join(lines) + "\n"
+        lines.clear()
+        
+        def _append():
+            self.upload_results.insert(tk.END, text)
+            self.upload_results.see(tk.END)
+        
+        self.upload_results.after_idle(_append)
+    
+    def _get_test_image(self, color: str) -> str:
+        """Get a cached 100x100 solid-color PNG for upload tests"""
+        path = self._test_image_cache.get(color)
+        if path and os.path.exists(path):
+            return path
+        
+        with tempfile.NamedTemporaryFile(suffix='.png', delete=False, dir=self._scratch_dir) as tf:
+            path = tf.name
+            Image.new('RGB', (100, 100), color=color).save(tf, 'PNG', compress_level=0)
+        
+        if not self._test_image_cache:
+            atexit.register(self._cleanup_test_images)
+        self._test_image_cache[color] = path
+        return path
+    
+    def _cleanup_test_images(self):
+        """Remove cached upload test images"""
+        for path in self._test_image_cache.values():
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        self._test_image_cache.clear()
+    
     def test_chevereto_guest(self):
         """Test Chevereto guest upload with proper credential handling"""
         self.log_message("📤 Testing Chevereto guest upload...")
         
         def run_guest_test():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            lines = []
             
             try:
                 if not self.chevereto_client:
-                    self.upload_results.insert(tk.END, "❌ Chevereto client not initialized\n")
-                    self.upload_results.insert(tk.END, "Check CHEVERETO_BASE_URL and CHEVERETO_GUEST_API_KEY in MCP.json\n")
-                    self.upload_results.see(tk.END)
+                    lines.append("❌ Chevereto client not initialized")
+                    lines.append("Check CHEVERETO_BASE_URL and CHEVERETO_GUEST_API_KEY in MCP.json")
                     return
                 
                 # Show which credentials and endpoints are being used
@@ -2216,48 +2507,40 @@ Detection Details:
                 base_url = self.config.get("CHEVERETO_BASE_URL", "Not set")
                 upload_endpoint = f"{base_url.rstrip('/')}/api/1/upload" if base_url != "Not set" else "Not set"
                 
-                self.upload_results.insert(tk.END, f"Guest API Key: {guest_key[:8]}...\n")
-                self.upload_results.insert(tk.END, f"Upload Endpoint: {upload_endpoint}\n")
-                self.upload_results.insert(tk.END, f"Auth Method: Parameter-based (key=...)\n")
+                lines.append(f"Guest API Key: {guest_key[:8]}...")
+                lines.append(f"Upload Endpoint: {upload_endpoint}")
+                lines.append(f"Auth Method: Parameter-based (key=...)")
                 
-                # Create a test image for upload
-                test_image_path = tempfile.mktemp(suffix='.png')
-                from PIL import Image
-                img = Image.new('RGB', (100, 100), color='blue')
-                img.save(test_image_path)
+                # Test image for upload (cached between clicks)
+                test_image_path = self._get_test_image('blue')
                 
-                self.upload_results.insert(tk.END, "Uploading test image...\n")
-                self.upload_results.see(tk.END)
+                lines.append("Uploading test image...")
                 
                 # Test guest upload (no user_id = guest mode)
-                self.upload_results.insert(tk.END, "🔍 Testing Guest API endpoint...\n")
-                self.upload_results.see(tk.END)
+                lines.append("🔍 Testing Guest API endpoint...")
+                self._flush_upload_lines(lines)
                 
-                result = loop.run_until_complete(
+                result = self.run_async(
                     self.chevereto_client.upload_image(test_image_path, user_id=None)
                 )
                 
-                if "url" in str(result).lower():
-                    self.upload_results.insert(tk.END, f"✅ Guest upload successful: {result}\n")
+                if result.get("url"):
+                    lines.append(f"✅ Guest upload successful: {result}")
                 else:
-                    self.upload_results.insert(tk.END, f"❌ Guest upload failed: {result}\n")
+                    lines.append(f"❌ Guest upload failed: {result}")
                     # Add troubleshooting info for 400/403 errors
-                    if "400" in str(result) or "403" in str(result) or "forbidden" in str(result).lower():
-                        self.upload_results.insert(tk.END, "⚠️  403/400 Error - Check API key permissions\n")
-                        self.upload_results.insert(tk.END, "  • Verify CHEVERETO_GUEST_API_KEY is correct\n")
-                        self.upload_results.insert(tk.END, "  • Check if guest uploads are enabled on server\n")
-                        self.upload_results.insert(tk.END, "  • Verify Chevereto server configuration\n")
-                
-                # Cleanup
-                os.unlink(test_image_path)
+                    if result.get("status_code") in (400, 403):
+                        lines.append("⚠️  403/400 Error - Check API key permissions")
+                        lines.append("  • Verify CHEVERETO_GUEST_API_KEY is correct")
+                        lines.append("  • Check if guest uploads are enabled on server")
+                        lines.append("  • Verify Chevereto server configuration")
                 
             except Exception as e:
-                self.upload_results.insert(tk.END, f"❌ Guest upload error: {e}\n")
+                lines.append(f"❌ Guest upload error: {e}")
                 if "400" in str(e) or "403" in str(e):
-                    self.upload_results.insert(tk.END, "⚠️  Authentication error - check guest API key\n")
+                    lines.append("⚠️  Authentication error - check guest API key")
             finally:
-                self.upload_results.see(tk.END)
-                loop.close()
+                self._flush_upload_lines(lines)
         
         threading.Thread(target=run_guest_test, daemon=True).start()
     
@@ -2270,22 +2553,21 @@ Detection Details:
         api_key = override_key if override_key else mcp_key
         
         if not api_key:
-            self.upload_results.insert(tk.END, "❌ No personal API key available\n")
-            self.upload_results.insert(tk.END, "  • Enter key in override field above, OR\n")
-            self.upload_results.insert(tk.END, "  • Set CHEVERETO_USER_API_KEY in MCP.json\n")
-            self.upload_results.see(tk.END)
+            self._flush_upload_lines([
+                "❌ No personal API key available",
+                "  • Enter key in override field above, OR",
+                "  • Set CHEVERETO_USER_API_KEY in MCP.json"
+            ])
             return
         
         self.log_message("🔑 Testing Chevereto personal API upload...")
         
         def run_personal_test():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            lines = []
             
             try:
                 if not self.chevereto_client:
-                    self.upload_results.insert(tk.END, "❌ Chevereto client not initialized\n")
-                    self.upload_results.see(tk.END)
+                    lines.append("❌ Chevereto client not initialized")
                     return
                 
                 # Show which credentials and endpoints are being used
@@ -2293,51 +2575,43 @@ Detection Details:
                 base_url = self.config.get("CHEVERETO_BASE_URL", "Not set")
                 upload_endpoint = f"{base_url.rstrip('/')}/api/1/upload" if base_url != "Not set" else "Not set"
                 
-                self.upload_results.insert(tk.END, f"Personal API Key ({source}): {api_key[:8]}...\n")
-                self.upload_results.insert(tk.END, f"Upload Endpoint: {upload_endpoint}\n")
-                self.upload_results.insert(tk.END, f"Auth Method: Header-based (X-API-Key)\n")
+                lines.append(f"Personal API Key ({source}): {api_key[:8]}...")
+                lines.append(f"Upload Endpoint: {upload_endpoint}")
+                lines.append(f"Auth Method: Header-based (X-API-Key)")
                 
                 # Update client with personal API key
                 self.chevereto_client.config.user_api_key = api_key
                 
-                # Create a test image for upload
-                test_image_path = tempfile.mktemp(suffix='.png')
-                from PIL import Image
-                img = Image.new('RGB', (100, 100), color='green')
-                img.save(test_image_path)
+                # Test image for upload (cached between clicks)
+                test_image_path = self._get_test_image('green')
                 
-                self.upload_results.insert(tk.END, "Uploading test image...\n")
-                self.upload_results.see(tk.END)
+                lines.append("Uploading test image...")
                 
                 # Test personal API upload with dummy user_id to trigger personal mode
-                self.upload_results.insert(tk.END, "🔍 Testing Personal API endpoint...\n")
-                self.upload_results.see(tk.END)
+                lines.append("🔍 Testing Personal API endpoint...")
+                self._flush_upload_lines(lines)
                 
-                result = loop.run_until_complete(
+                result = self.run_async(
                     self.chevereto_client.upload_image(test_image_path, user_id="test_user")
                 )
                 
-                if "url" in str(result).lower():
-                    self.upload_results.insert(tk.END, f"✅ Personal API upload successful: {result}\n")
+                if result.get("url"):
+                    lines.append(f"✅ Personal API upload successful: {result}")
                 else:
-                    self.upload_results.insert(tk.END, f"❌ Personal API upload failed: {result}\n")
+                    lines.append(f"❌ Personal API upload failed: {result}")
                     # Add troubleshooting info for 400/403 errors
-                    if "400" in str(result) or "403" in str(result) or "forbidden" in str(result).lower():
-                        self.upload_results.insert(tk.END, "⚠️  403/400 Error - Check API key permissions\n")
-                        self.upload_results.insert(tk.END, "  • Verify personal API key is correct\n")
-                        self.upload_results.insert(tk.END, "  • Check if user has upload permissions\n")
-                        self.upload_results.insert(tk.END, "  • Verify API key hasn't expired\n")
-                
-                # Cleanup
-                os.unlink(test_image_path)
+                    if result.get("status_code") in (400, 403):
+                        lines.append("⚠️  403/400 Error - Check API key permissions")
+                        lines.append("  • Verify personal API key is correct")
+                        lines.append("  • Check if user has upload permissions")
+                        lines.append("  • Verify API key hasn't expired")
                 
             except Exception as e:
-                self.upload_results.insert(tk.END, f"❌ Personal API upload error: {e}\n")
+                lines.append(f"❌ Personal API upload error: {e}")
                 if "400" in str(e) or "403" in str(e):
-                    self.upload_results.insert(tk.END, "⚠️  Authentication error - check personal API key\n")
+                    lines.append("⚠️  Authentication error - check personal API key")
             finally:
-                self.upload_results.see(tk.END)
-                loop.close()
+                self._flush_upload_lines(lines)
         
         threading.Thread(target=run_personal_test, daemon=True).start()
     
@@ -2346,12 +2620,8 @@ Detection Details:
         self.log_message("💾 Testing local upload...")
         
         def run_local_upload():
+            lines = []
             try:
-                import tempfile
-                import asyncio
-                from PIL import Image
-                from modules.stable_diffusion.chevereto_client import CheveretoClient, CheveretoConfig
-                
                 # Create CheveretoConfig that will force local fallback
                 config = CheveretoConfig(
                     base_url='',  # Empty to force local fallback
@@ -2362,64 +2632,49 @@ Detection Details:
                 
                 client = CheveretoClient(config)
                 
-                # Create a test image
-                with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                    img = Image.new('RGB', (100, 100), color='red')
-                    img.save(tmp.name, 'PNG')
-                    test_image_path = tmp.name
+                # Test image (cached between clicks)
+                test_image_path = self._get_test_image('red')
                 
-                try:
-                    # Run the local upload test
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
+                # Run the local upload test
+                result = self.run_async(
+                    client._fallback_local_upload(test_image_path, user_id='gui_test')
+                )
+                
+                if result.get('success'):
+                    url = result.get('url', 'No URL')
+                    local_path = result.get('local_path', 'No path')
+                    filename = result.get('filename', 'No filename')
                     
-                    result = loop.run_until_complete(
-                        client._fallback_local_upload(test_image_path, user_id='gui_test')
-                    )
+                    lines.append(f"✅ Local upload successful!")
+                    lines.append(f"   HTTP URL: {url}")
+                    lines.append(f"   Local Path: {local_path}")
+                    lines.append(f"   Filename: {filename}")
+                    lines.append(f"   Hosting: {result.get('hosting_service', 'unknown')}")
                     
-                    if result.get('success'):
-                        url = result.get('url', 'No URL')
-                        local_path = result.get('local_path', 'No path')
-                        filename = result.get('filename', 'No filename')
+                    # Verify the HTTP URL format and server availability
+                    if 'http://' in url and '/images/' in url:
+                        lines.append(f"✅ HTTP URL format is correct")
                         
-                        self.upload_results.insert(tk.END, f"✅ Local upload successful!\n")
-                        self.upload_results.insert(tk.END, f"   HTTP URL: {url}\n")
-                        self.upload_results.insert(tk.END, f"   Local Path: {local_path}\n")
-                        self.upload_results.insert(tk.END, f"   Filename: {filename}\n")
-                        self.upload_results.insert(tk.END, f"   Hosting: {result.get('hosting_service', 'unknown')}\n")
-                        
-                        # Verify the HTTP URL format and server availability
-                        if 'http://' in url and '/images/' in url:
-                            self.upload_results.insert(tk.END, f"✅ HTTP URL format is correct\n")
-                            
-                            # Check if HTTP server is actually running
-                            try:
-                                import httpx
-                                server_url = url.split('/images/')[0] + '/info'
-                                with httpx.Client() as client:
-                                    response = client.get(server_url, timeout=3)
-                                    self.upload_results.insert(tk.END, f"✅ HTTP server is running - URL is accessible\n")
-                            except Exception as e:
-                                self.upload_results.insert(tk.END, f"⚠️ HTTP server not running - URL won't work in browser\n")
-                                self.upload_results.insert(tk.END, f"   Click '🌐 Start HTTP Server' button to serve files\n")
-                                self.upload_results.insert(tk.END, f"   Or use file:// URL: file://{local_path}\n")
-                        else:
-                            self.upload_results.insert(tk.END, f"❌ HTTP URL format incorrect\n")
+                        # Check if HTTP server is actually running
+                        try:
+                            server_url = url.split('/images/')[0] + '/info'
+                            _probe_client.get(server_url)
+                            lines.append(f"✅ HTTP server is running - URL is accessible")
+                        except Exception as e:
+                            lines.append(f"⚠️ HTTP server not running - URL won't work in browser")
+                            lines.append(f"   Click '🌐 Start HTTP Server' button to serve files")
+                            lines.append(f"   Or use file:// URL: file://{local_path}")
                     else:
-                        error = result.get('error', 'Unknown error')
-                        self.upload_results.insert(tk.END, f"❌ Local upload failed: {error}\n")
-                        
-                finally:
-                    # Cleanup test image
-                    try:
-                        os.unlink(test_image_path)
-                    except:
-                        pass
-                        
+                        lines.append(f"❌ HTTP URL format incorrect")
+                else:
+                    error = result.get('error', 'Unknown error')
+                    lines.append(f"❌ Local upload failed: {error}")
+                
             except Exception as e:
-                self.upload_results.insert(tk.END, f"❌ Local upload error: {e}\n")
-                import traceback
-                self.upload_results.insert(tk.END, f"   Details: {traceback.format_exc()}\n")
+                lines.append(f"❌ Local upload error: {e}")
+                lines.append(f"   Details: {traceback.format_exc()}")
+            finally:
+                self._flush_upload_lines(lines)
         
         # Run in thread to avoid blocking GUI
         threading.Thread(target=run_local_upload, daemon=True).start()
@@ -2432,10 +2687,7 @@ Detection Details:
             
             # Reload configuration from MCP.json
             self.log_message("🔄 Reloading configuration from MCP.json...")
-            mcp_config = get_mcp_config()
-            if not mcp_config.is_loaded:
-                mcp_config.load_config()
-            current_config = mcp_config.env_vars
+            current_config = self._mcp_env()
             
             # Show current API keys from live configuration
             guest_key = current_config.get("CHEVERETO_GUEST_API_KEY", "Not set")
@@ -2446,18 +2698,15 @@ Detection Details:
             discord_enabled = current_config.get("ENABLE_DISCORD", "false")
             
             # Mask keys for security
-            def mask_key(key):
-                if key == "Not set" or not key:
-                    return "Not set"
-                return f"{key[:8]}..." if len(key) > 8 else key
-            
-            display_text = f"""Base URL: {base_url}
-Guest API Key: {mask_key(guest_key)}
-User API Key: {mask_key(user_key)}
-Admin API Key: {mask_key(admin_key)}
-
-Discord Bot Token: {mask_key(discord_token)}
-Discord Enabled: {discord_enabled}"""
+            display_text = "\n".join([
+                f"Base URL: {base_url}",
+                f"Guest API Key: {_mask_key(guest_key)}",
+                f"User API Key: {_mask_key(user_key)}",
+                f"Admin API Key: {_mask_key(admin_key)}",
+                "",
+                f"Discord Bot Token: {_mask_key(discord_token)}",
+                f"Discord Enabled: {discord_enabled}"
+            ])
             
             self.api_keys_display.insert("1.0", display_text)
             self.log_message("🔄 API keys display refreshed")
@@ -2465,13 +2714,43 @@ Discord Enabled: {discord_enabled}"""
         except Exception as e:
             self.log_message(f"❌ Error refreshing API keys display: {e}")
     
+    def _launch_in_terminal(self, script_name: str) -> bool:
+        """Run a project script with uv in a new terminal window"""
+        command = f"uv run python {script_name}"
+        
+        if self._system == "windows":
+            # Windows: Open new Command Prompt
+            subprocess.Popen([
+                "cmd", "/c", "start", "cmd", "/k", 
+                f"cd /d \"{self._repo_dir}\" && {command}"
+            ], shell=True)
+        elif self._system == "darwin":  # macOS
+            # macOS: Open new Terminal window
+            script = f'''
+tell application "Terminal"
+    do script "cd '{self._repo_dir}' && {command}"
+    activate
+end tell
+'''
+            subprocess.run(["osascript", "-e", script])
+        else:  # Linux
+            # Linux: Use the terminal emulator found at startup
+            if not self._linux_terminal:
+                self.log_service_message("❌ No terminal emulator found")
+                return False
+            
+            flag = _TERMINAL_EXEC_FLAGS[self._linux_terminal]
+            subprocess.Popen([
+                self._linux_terminal, flag, "bash", "-c",
+                f"cd '{self._repo_dir}' && {command}; exec bash"
+            ])
+        
+        return True
+    
     def launch_discord_bot(self):
         """Launch Discord bot in a new terminal/process"""
         try:
-            import subprocess
-            import platform
-            
-            bot_script = Path(__file__).parent / "start_discord_bot.py"
+            bot_script = self._repo_dir / "start_discord_bot.py"
             
             if not bot_script.exists():
                 self.log_service_message("❌ start_discord_bot.py not found")
@@ -2479,46 +2758,8 @@ Discord Enabled: {discord_enabled}"""
             
             self.log_service_message("🤖 Launching Discord bot...")
             
-            system = platform.system().lower()
-            
-            if system == "windows":
-                # Windows: Open new Command Prompt
-                subprocess.Popen([
-                    "cmd", "/c", "start", "cmd", "/k", 
-                    f"cd /d \"{Path(__file__).parent}\" && uv run python start_discord_bot.py"
-                ], shell=True)
-            elif system == "darwin":  # macOS
-                # macOS: Open new Terminal window
-                script = f'''
-tell application "Terminal"
-    do script "cd '{Path(__file__).parent}' && uv run python start_discord_bot.py"
-    activate
-end tell
-'''
-                subprocess.run(["osascript", "-e", script])
-            else:  # Linux
-                # Linux: Try common terminal emulators
-                terminals = ["gnome-terminal", "konsole", "xterm", "terminator"]
-                for terminal in terminals:
-                    try:
-                        if terminal == "gnome-terminal":
-                            subprocess.Popen([
-                                terminal, "--", "bash", "-c",
-                                f"cd '{Path(__file__).parent}' && uv run python start_discord_bot.py; exec bash"
-                            ])
-                        else:
-                            subprocess.Popen([
-                                terminal, "-e", "bash", "-c",
-                                f"cd '{Path(__file__).parent}' && uv run python start_discord_bot.py; exec bash"
-                            ])
-                        break
-                    except FileNotFoundError:
-                        continue
-                else:
-                    self.log_service_message("❌ No terminal emulator found")
-                    return
-            
-            self.log_service_message("✅ Discord bot launched in new terminal")
+            if self._launch_in_terminal("start_discord_bot.py"):
+                self.log_service_message("✅ Discord bot launched in new terminal")
             
         except Exception as e:
             self.log_service_message(f"❌ Failed to launch Discord bot: {e}")
@@ -2526,10 +2767,7 @@ end tell
     def launch_mcp_server(self):
         """Launch MCP HTTP server in a new terminal/process"""
         try:
-            import subprocess
-            import platform
-            
-            server_script = Path(__file__).parent / "mcp_http_server.py"
+            server_script = self._repo_dir / "mcp_http_server.py"
             
             if not server_script.exists():
                 self.log_service_message("❌ mcp_http_server.py not found")
@@ -2537,84 +2775,57 @@ end tell
             
             self.log_service_message("🔗 Launching MCP HTTP server...")
             
-            system = platform.system().lower()
-            
-            if system == "windows":
-                subprocess.Popen([
-                    "cmd", "/c", "start", "cmd", "/k", 
-                    f"cd /d \"{Path(__file__).parent}\" && uv run python mcp_http_server.py"
-                ], shell=True)
-            elif system == "darwin":  # macOS
-                script = f'''
-tell application "Terminal"
-    do script "cd '{Path(__file__).parent}' && uv run python mcp_http_server.py"
-    activate
-end tell
-'''
-                subprocess.run(["osascript", "-e", script])
-            else:  # Linux
-                terminals = ["gnome-terminal", "konsole", "xterm", "terminator"]
-                for terminal in terminals:
-                    try:
-                        if terminal == "gnome-terminal":
-                            subprocess.Popen([
-                                terminal, "--", "bash", "-c",
-                                f"cd '{Path(__file__).parent}' && uv run python mcp_http_server.py; exec bash"
-                            ])
-                        else:
-                            subprocess.Popen([
-                                terminal, "-e", "bash", "-c",
-                                f"cd '{Path(__file__).parent}' && uv run python mcp_http_server.py; exec bash"
-                            ])
-                        break
-                    except FileNotFoundError:
-                        continue
-                else:
-                    self.log_service_message("❌ No terminal emulator found")
-                    return
-            
-            self.log_service_message("✅ MCP HTTP server launched in new terminal")
+            if self._launch_in_terminal("mcp_http_server.py"):
+                self.log_service_message("✅ MCP HTTP server launched in new terminal")
             
         except Exception as e:
             self.log_service_message(f"❌ Failed to launch MCP server: {e}")
     
     def run_health_check(self):
         """Run health check script"""
-        try:
-            import subprocess
-            
-            health_script = Path(__file__).parent / "health_check.py"
-            
-            if not health_script.exists():
-                self.log_service_message("❌ health_check.py not found")
-                return
-            
-            self.log_service_message("🏥 Running health check...")
-            
-            # Run health check and capture output
-            result = subprocess.run([
-                "uv", "run", "python", str(health_script)
-            ], cwd=Path(__file__).parent, capture_output=True, text=True, timeout=60)
-            
-            if result.returncode == 0:
-                self.log_service_message("✅ Health check completed successfully")
-                self.log_service_message(f"Output: {result.stdout}")
-            else:
-                self.log_service_message("❌ Health check failed")
-                self.log_service_message(f"Error: {result.stderr}")
+        health_script = self._repo_dir / "health_check.py"
+        
+        if not health_script.exists():
+            self.log_service_message("❌ health_check.py not found")
+            return
+        
+        self.log_service_message("🏥 Running health check...")
+        
+        def health_check():
+            try:
+                # Import the script once and call its main() in-process instead of spawning uv
+                if self._health_mod is None:
+                    spec = importlib.util.spec_from_file_location("health_check", health_script)
+                    module = importlib.util.module_from_spec(spec)
+                    spec.loader.exec_module(module)
+                    self._health_mod = module
+                
+                # Collect the report and the checker's log lines without touching sys.stdout
+                output = io.StringIO()
+                log_handler = logging.StreamHandler(output)
+                self._health_mod.logger.addHandler(log_handler)
+                try:
+                    healthy = self.run_async(self._health_mod.main(out=output), timeout=60)
+                finally:
+                    self._health_mod.logger.removeHandler(log_handler)
                 
-        except subprocess.TimeoutExpired:
-            self.log_service_message("⚠️  Health check timed out after 60 seconds")
-        except Exception as e:
-            self.log_service_message(f"❌ Failed to run health check: {e}")
+                if healthy:
+                    self.log_service_message("✅ Health check completed successfully")
+                    self.log_service_message(f"Output: {output.getvalue()}")
+                else:
+                    self.log_service_message("❌ Health check failed")
+                    self.log_service_message(f"Error: {output.getvalue()}")
+                    
+            except TimeoutError:
+                self.log_service_message("⚠️  Health check timed out after 60 seconds")
+            except Exception as e:
+                self.log_service_message(f"❌ Failed to run health check: {e}")
+        
+        threading.Thread(target=health_check, daemon=True).start()
     
     def log_service_message(self, message: str):
         """Log message to service status area"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {message}\n"
-        self.service_status.insert(tk.END, formatted_message)
-        self.service_status.see(tk.END)
-        self.root.update()
+        self.log_message(message, self.service_status)
     
     def validate_configuration(self):
         """Validate MCP.json configuration"""
@@ -2629,8 +2840,7 @@ end tell
             validation_results += f"✅ MCP.json found: {mcp_path}\n\n"
             
             try:
-                with open(mcp_path) as f:
-                    mcp_config = json.load(f)
+                mcp_config = read_mcp_json(mcp_path)
                 
                 # Check SD_MCP_Server section
                 sd_server = mcp_config.get("mcpServers", {}).get("SD_MCP_Server", {})
@@ -2646,18 +2856,19 @@ end tell
                         required_vars = ["SD_BASE_URL", "LM_STUDIO_BASE_URL"]
                         validation_results += "Required Variables:\n"
                         for var in required_vars:
-                            if var in env_vars:
-                                validation_results += f"✅ {var}: {env_vars[var]}\n"
+                            value = env_vars.get(var)
+                            if value is not None:
+                                validation_results += f"✅ {var}: {value}\n"
                             else:
                                 validation_results += f"❌ {var}: Missing from MCP.json\n"
                         
                         # Check optional variables
-                        optional_vars = ["DISCORD_BOT_TOKEN", "CHEVERETO_BASE_URL", "CHEVERETO_GUEST_API_KEY", "CHEVERETO_USER_API_KEY"]
                         validation_results += "\nOptional Variables:\n"
-                        for var in optional_vars:
-                            if var in env_vars:
-                                value = str(env_vars[var])
-                                if "TOKEN" in var or "KEY" in var:
+                        for var in _OPTIONAL_MCP_VARS:
+                            value = env_vars.get(var)
+                            if value is not None:
+                                value = str(value)
+                                if var in _SECRET_MCP_VARS:
                                     masked_value = f"{value[:8]}..." if len(value) > 8 else value
                                 else:
                                     masked_value = value
@@ -2666,13 +2877,20 @@ end tell
                                 validation_results += f"⚪ {var}: Not in MCP.json\n"
                         
                         # Check NudeNet configuration
-                        nudenet_vars = [k for k in env_vars.keys() if k.startswith("NUDENET_")]
-                        if nudenet_vars:
-                            validation_results += f"\n✅ NudeNet configuration: {len(nudenet_vars)} settings\n"
-                            for var in nudenet_vars[:5]:  # Show first 5
-                                validation_results += f"  • {var}: {env_vars[var]}\n"
-                            if len(nudenet_vars) > 5:
-                                validation_results += f"  • ... and {len(nudenet_vars) - 5} more\n"
+                        # One pass: count every NUDENET_ setting, keep only the first 5 for display
+                        nudenet_total = 0
+                        nudenet_shown = []
+                        for k, v in env_vars.items():
+                            if k.startswith("NUDENET_"):
+                                nudenet_total += 1
+                                if len(nudenet_shown) < 5:
+                                    nudenet_shown.append((k, v))
+                        if nudenet_total:
+                            validation_results += f"\n✅ NudeNet configuration: {nudenet_total} settings\n"
+                            for var, value in nudenet_shown:
+                                validation_results += f"  • {var}: {value}\n"
+                            if nudenet_total > 5:
+                                validation_results += f"  • ... and {nudenet_total - 5} more\n"
                         else:
                             validation_results += "\n⚪ NudeNet configuration: Not found\n"
                             
@@ -2693,10 +2911,11 @@ end tell
         validation_results += "\n" + "=" * 40 + "\n"
         validation_results += "Current Environment (after MCP.json load):\n"
         mcp_vars = self.get_mcp_variables()
-        for var in ["SD_BASE_URL", "LM_STUDIO_BASE_URL", "CHEVERETO_BASE_URL"]:
-            value = os.getenv(var, "Not set")
-            source = "(from MCP.json)" if var in mcp_vars else "(from environment)" if value != "Not set" else ""
-            validation_results += f"{var}: {value} {source}\n"
+        environ = os.environ
+        for var in ("SD_BASE_URL", "LM_STUDIO_BASE_URL", "CHEVERETO_BASE_URL"):
+            value = environ.get(var)
+            source = "(from MCP.json)" if var in mcp_vars else "(from environment)" if value is not None else ""
+            validation_results += f"{var}: {value if value is not None else 'Not set'} {source}\n"
         
         self.config_results.delete("1.0", tk.END)
         self.config_results.insert("1.0", validation_results)
@@ -2716,16 +2935,37 @@ end tell
     
     def log_db_message(self, message: str):
         """Log message to database status text area"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {message}\n"
-        self.db_status_text.insert(tk.END, formatted_message)
-        self.db_status_text.see(tk.END)
-        self.root.update()
+        self.log_message(message, self.db_status_text)
     
     def get_db_path(self, db_name: str) -> Path:
         """Get full path for database file"""
         return Path(self.db_location.get()) / db_name
     
+    @staticmethod
+    def _db_files(db_location: Path) -> List[Path]:
+        """List *.db files in a directory; scandir's cached entry type avoids a stat per file"""
+        with os.scandir(db_location) as entries:
+            return [Path(e.path) for e in entries if e.name.endswith('.db') and e.is_file()]
+    
+    @staticmethod
+    def _probe_db(db_path: Path) -> tuple:
+        """Return (status, detail) for a database file: ok/table count, invalid/error or missing"""
+        if not db_path.exists():
+            return "missing", None
+        # Check if it's a valid SQLite database
+        try:
+            # Read-only open skips journal setup; count in SQL instead of fetching names
+            conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+            try:
+                table_count = conn.execute(
+                    "SELECT count(*) FROM sqlite_master WHERE type='table'"
+                ).fetchone()[0]
+            finally:
+                conn.close()
+            return "ok", table_count
+        except sqlite3.Error as e:
+            return "invalid", e
+    
     def check_databases(self):
         """Check status of all databases"""
         self.log_db_message("🔍 Checking database status...")
@@ -2748,25 +2988,17 @@ end tell
         missing = []
         existing = []
         
-        for db_name, description in required_databases.items():
-            db_path = db_location / db_name
-            
-            if db_path.exists():
-                # Check if it's a valid SQLite database
-                try:
-                    import sqlite3
-                    conn = sqlite3.connect(str(db_path))
-                    cursor = conn.cursor()
-                    cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-                    tables = cursor.fetchall()
-                    conn.close()
-                    
-                    self.log_db_message(f"✅ {db_name}: {len(tables)} tables - {description}")
-                    existing.append(db_name)
-                    
-                except sqlite3.Error as e:
-                    self.log_db_message(f"⚠️  {db_name}: Corrupt or invalid - {e}")
-                    missing.append(db_name)
+        # Probe the files concurrently, then report in order from this (GUI) thread
+        with ThreadPoolExecutor(max_workers=len(required_databases)) as pool:
+            probes = list(pool.map(self._probe_db, (db_location / name for name in required_databases)))
+        
+        for (db_name, description), (status, detail) in zip(required_databases.items(), probes):
+            if status == "ok":
+                self.log_db_message(f"✅ {db_name}: {detail} tables - {description}")
+                existing.append(db_name)
+            elif status == "invalid":
+                self.log_db_message(f"⚠️  {db_name}: Corrupt or invalid - {detail}")
+                missing.append(db_name)
             else:
                 self.log_db_message(f"❌ {db_name}: Missing - {description}")
                 missing.append(db_name)
@@ -2799,68 +3031,50 @@ end tell
                 # Ensure directory exists
                 db_location.mkdir(parents=True, exist_ok=True)
                 
-                # Save current directory and change to db location
-                original_cwd = Path.cwd()
-                os.chdir(db_location)
+                # Import the init script functions
+                from scripts.init_databases import (
+                    create_chevereto_users_db,
+                    create_discord_users_db, 
+                    create_lora_database
+                )
+                from modules.llm.llm_database import LLMDatabase
+                from modules.stable_diffusion.content_db import ContentDatabase
                 
-                try:
-                    # Import and run database initialization
-                    import sys
-                    sys.path.insert(0, str(original_cwd))
-                    
-                    # Import the init script functions
-                    from scripts.init_databases import (
-                        create_chevereto_users_db,
-                        create_discord_users_db, 
-                        create_lora_database
-                    )
-                    from modules.llm.llm_database import LLMDatabase
-                    from modules.stable_diffusion.content_db import ContentDatabase
-                    
-                    created_count = 0
-                    
-                    # Create basic databases if missing
-                    if not Path("chevereto_users.db").exists():
-                        create_chevereto_users_db()
-                        self.log_db_message("✅ Created chevereto_users.db")
-                        created_count += 1
-                    
-                    if not Path("discord_users.db").exists():
-                        create_discord_users_db()
-                        self.log_db_message("✅ Created discord_users.db")
-                        created_count += 1
-                    
-                    if not Path("lora_database.db").exists():
-                        create_lora_database()
-                        self.log_db_message("✅ Created lora_database.db")
-                        created_count += 1
-                    
-                    # Create LLM database if missing
-                    if not Path("discord_llm.db").exists():
-                        llm_db = LLMDatabase()
-                        self.log_db_message("✅ Created discord_llm.db with personalities")
-                        created_count += 1
-                    
-                    # Create content database if missing
-                    modules_path = Path("modules/stable_diffusion")
-                    if not (modules_path / "content_mapping.db").exists():
-                        modules_path.mkdir(parents=True, exist_ok=True)
-                        os.chdir(modules_path.parent.parent)  # Back to project root for content db
-                        content_db = ContentDatabase()
-                        self.log_db_message("✅ Created content_mapping.db with classification system")
-                        created_count += 1
-                    
-                    if created_count == 0:
-                        self.log_db_message("ℹ️ All databases already exist")
-                    else:
-                        self.log_db_message(f"🎉 Created {created_count} databases successfully!")
-                    
-                except Exception as e:
-                    self.log_db_message(f"❌ Error creating databases: {e}")
-                    
-                finally:
-                    # Restore original directory
-                    os.chdir(original_cwd)
+                # (target file, creator, success message) for each database; every creator
+                # gets an explicit location so the process working directory is never changed
+                llm_path = db_location / "discord_llm.db"
+                content_path = db_location / "content_mapping.db"
+                steps = [
+                    (db_location / "chevereto_users.db", functools.partial(create_chevereto_users_db, db_location),
+                     "✅ Created chevereto_users.db"),
+                    (db_location / "discord_users.db", functools.partial(create_discord_users_db, db_location),
+                     "✅ Created discord_users.db"),
+                    (db_location / "lora_database.db", functools.partial(create_lora_database, db_location),
+                     "✅ Created lora_database.db"),
+                    (llm_path, functools.partial(LLMDatabase, str(llm_path)),
+                     "✅ Created discord_llm.db with personalities"),
+                    (content_path, functools.partial(ContentDatabase, str(content_path)),
+                     "✅ Created content_mapping.db with classification system"),
+                ]
+                missing = [step for step in steps if not step[0].exists()]
+                
+                # The creators are independent, so overlap their schema setup and fsyncs
+                created_count = 0
+                if missing:
+                    with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+                        futures = [(pool.submit(create), message) for _, create, message in missing]
+                        for future, message in futures:
+                            try:
+                                future.result()
+                                self.log_db_message(message)
+                                created_count += 1
+                            except Exception as e:
+                                self.log_db_message(f"❌ Error creating databases: {e}")
+                
+                if not missing:
+                    self.log_db_message("ℹ️ All databases already exist")
+                elif created_count:
+                    self.log_db_message(f"🎉 Created {created_count} databases successfully!")
                     
             except Exception as e:
                 self.log_db_message(f"❌ Database creation failed: {e}")
@@ -2884,12 +3098,11 @@ end tell
                 
                 # Backup existing databases
                 backed_up = 0
-                for db_file in db_location.glob("*.db"):
-                    if db_file.is_file():
-                        backup_path = backup_dir / db_file.name
-                        db_file.rename(backup_path)
-                        backed_up += 1
-                        self.log_db_message(f"📦 Backed up {db_file.name}")
+                for db_file in self._db_files(db_location):
+                    backup_path = backup_dir / db_file.name
+                    db_file.rename(backup_path)
+                    backed_up += 1
+                    self.log_db_message(f"📦 Backed up {db_file.name}")
                 
                 if backed_up > 0:
                     self.log_db_message(f"📦 Backed up {backed_up} databases to {backup_dir.name}")
@@ -2918,30 +3131,46 @@ end tell
                 backup_dir.mkdir(parents=True, exist_ok=True)
                 
                 backed_up = 0
-                for db_file in db_location.glob("*.db"):
-                    if db_file.is_file():
-                        backup_path = backup_dir / db_file.name
-                        import shutil
-                        shutil.copy2(db_file, backup_path)
-                        backed_up += 1
-                        self.log_db_message(f"📦 Backed up {db_file.name}")
+                for db_file in self._db_files(db_location):
+                    backup_path = backup_dir / db_file.name
+                    # VACUUM INTO writes a consistent, compacted snapshot even while the DB is in use
+                    try:
+                        conn = sqlite3.connect(str(db_file))
+                        try:
+                            conn.execute("VACUUM INTO ?", (str(backup_path),))
+                        finally:
+                            conn.close()
+                    except sqlite3.Error:
+                        # Not a SQLite file, or SQLite older than 3.27
+                        backup_path.unlink(missing_ok=True)
+                        _fast_copy(db_file, backup_path)
+                    backed_up += 1
+                    self.log_db_message(f"📦 Backed up {db_file.name}")
                 
                 # Clean conversations older than 30 days
                 llm_db_path = db_location / "discord_llm.db"
                 if llm_db_path.exists():
-                    import sqlite3
+                    # Same text format as CURRENT_TIMESTAMP (UTC), computed once instead of per row
+                    cutoff = (datetime.now(timezone.utc) - timedelta(days=30)).strftime('%Y-%m-%d %H:%M:%S')
                     conn = sqlite3.connect(str(llm_db_path))
-                    cursor = conn.cursor()
-                    
-                    # Delete old conversations
-                    cursor.execute("""
-                        DELETE FROM conversations 
-                        WHERE timestamp < datetime('now', '-30 days')
-                    """)
-                    
-                    deleted = cursor.rowcount
-                    conn.commit()
-                    conn.close()
+                    try:
+                        conn.execute("PRAGMA synchronous=NORMAL")
+                        conn.execute("CREATE INDEX IF NOT EXISTS idx_conv_created ON conversations (created_at)")
+                        
+                        # Delete old conversations in chunks to keep each transaction's journal small
+                        deleted = 0
+                        while True:
+                            cursor = conn.execute("""
+                                DELETE FROM conversations WHERE rowid IN (
+                                    SELECT rowid FROM conversations WHERE created_at < ? LIMIT 5000
+                                )
+                            """, (cutoff,))
+                            conn.commit()
+                            if cursor.rowcount <= 0:
+                                break
+                            deleted += cursor.rowcount
+                    finally:
+                        conn.close()
                     
                     if deleted > 0:
                         self.log_db_message(f"🧹 Cleaned {deleted} old conversation messages")
@@ -2963,15 +3192,10 @@ end tell
             try:
                 # Import LoRAManager and initialize
                 from modules.stable_diffusion.lora_manager import LoRAManager
-                from modules.stable_diffusion.sd_client import SDClient
                 from modules.stable_diffusion.auth_manager import create_auth_manager_from_env
-                from modules.config import get_mcp_config
                 
                 # Load config to get SD base URL
-                config = get_mcp_config()
-                if not config.is_loaded:
-                    config.load_config()
-                env_vars = config.env_vars
+                env_vars = self._mcp_env()
                 
                 sd_base_url = env_vars.get('SD_BASE_URL', 'http://localhost:7860')
                 self.log_db_message(f"🔗 Connecting to SD WebUI at {sd_base_url}")
@@ -2985,17 +3209,13 @@ end tell
                 lora_manager = LoRAManager(db_path=str(db_path), sd_client=sd_client)
                 
                 # Run sync
-                import asyncio
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                
-                updated_count = loop.run_until_complete(lora_manager.sync_with_sd_api())
+                updated_count = self.run_async(lora_manager.sync_with_sd_api())
                 
                 self.log_db_message(f"✅ LoRA sync complete! Updated {updated_count} entries")
                 
                 # Test the sync by doing a quick search
                 results = lora_manager.search_loras_smart("", max_results=5)
-                total_loras = len(lora_manager.search_loras_smart("", max_results=1000))
+                total_loras = lora_manager.count()
                 
                 self.log_db_message(f"📊 Total LoRAs in database: {total_loras}")
                 if results:
@@ -3006,7 +3226,6 @@ end tell
             except Exception as e:
                 self.log_db_message(f"❌ LoRA sync failed: {str(e)}")
                 # Log more details for debugging
-                import traceback
                 self.log_db_message(f"🔍 Error details: {traceback.format_exc()}")
         
         threading.Thread(target=sync_lora, daemon=True).start()
@@ -3017,25 +3236,16 @@ end tell
         
         def start_server():
             try:
-                import subprocess
-                import httpx
-                import time
-                from modules.config import get_mcp_config
-                
                 # Check if server is already running
                 try:
-                    with httpx.Client() as client:
-                        response = client.get('http://127.0.0.1:8000/info', timeout=3)
-                        self.log_db_message(f"✅ HTTP server already running (status: {response.status_code})")
-                        return
+                    response = _probe_client.get('http://127.0.0.1:8000/info')
+                    self.log_db_message(f"✅ HTTP server already running (status: {response.status_code})")
+                    return
                 except:
                     pass  # Server not running, proceed to start it
                 
                 # Get config for host/port
-                config = get_mcp_config()
-                if not config.is_loaded:
-                    config.load_config()
-                env_vars = config.env_vars
+                env_vars = self._mcp_env()
                 
                 host = env_vars.get('MCP_HTTP_HOST', '127.0.0.1')
                 port = env_vars.get('MCP_HTTP_PORT', '8000')
@@ -3047,19 +3257,30 @@ end tell
                     sys.executable, 'mcp_http_server.py'
                 ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
                 
-                # Wait a moment for server to start
-                time.sleep(3)
+                # Poll until the server answers, backing off from 50ms up to 500ms
+                info_url = f'http://{host}:{port}/info'
+                deadline = time.monotonic() + 10
+                delay = 0.05
+                response = None
+                while time.monotonic() < deadline and server_process.poll() is None:
+                    try:
+                        response = _probe_client.get(info_url, timeout=0.5)
+                        break
+                    except httpx.HTTPError:
+                        time.sleep(delay)
+                        delay = min(delay * 1.7, 0.5)
                 
                 # Check if server started successfully
                 try:
-                    with httpx.Client() as client:
-                        response = client.get(f'http://{host}:{port}/info', timeout=5)
-                        server_info = response.json()
-                        self.log_db_message(f"✅ HTTP server started successfully!")
-                        self.log_db_message(f"   Server: {server_info.get('name', 'Unknown')}")
-                        self.log_db_message(f"   Version: {server_info.get('version', 'Unknown')}")
-                        self.log_db_message(f"   URL: http://{host}:{port}")
-                        self.log_db_message(f"   Images endpoint: http://{host}:{port}/images/<filename>")
+                    if response is None:
+                        # One last full-timeout attempt surfaces the real connection error
+                        response = _probe_client.get(info_url, timeout=5)
+                    server_info = response.json()
+                    self.log_db_message(f"✅ HTTP server started successfully!")
+                    self.log_db_message(f"   Server: {server_info.get('name', 'Unknown')}")
+                    self.log_db_message(f"   Version: {server_info.get('version', 'Unknown')}")
+                    self.log_db_message(f"   URL: http://{host}:{port}")
+                    self.log_db_message(f"   Images endpoint: http://{host}:{port}/images/<filename>")
                     
                     # Store process reference for cleanup if needed
                     if not hasattr(self, '_http_server_process'):
@@ -3072,7 +3293,6 @@ end tell
                     
             except Exception as e:
                 self.log_db_message(f"❌ Error starting HTTP server: {e}")
-                import traceback
                 self.log_db_message(f"🔍 Details: {traceback.format_exc()}")
         
         threading.Thread(target=start_server, daemon=True).start()
@@ -3097,17 +3317,12 @@ end tell
         def run_analysis():
             try:
                 # Test the MCP tool directly
-                import asyncio
                 from scripts.mcp_servers.sd_mcp_server import analyze_prompt
                 
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                
-                result = loop.run_until_complete(analyze_prompt(prompt))
+                result = self.run_async(analyze_prompt(prompt))
                 
                 # Parse and display results
-                import json
-                analysis_data = json.loads(result)
+                analysis_data = _json_loads(result)
                 
                 self.log_analysis_message("✅ Prompt analysis completed!")
                 self.log_analysis_message(f"📈 Results:")
@@ -3150,7 +3365,6 @@ end tell
                 
             except Exception as e:
                 self.log_analysis_message(f"❌ Analysis failed: {e}")
-                import traceback
                 self.log_analysis_message(f"🔍 Details: {traceback.format_exc()}")
         
         threading.Thread(target=run_analysis, daemon=True).start()
@@ -3167,14 +3381,10 @@ end tell
         def run_enhanced_generation():
             try:
                 # Test the MCP tool with enhancement enabled
-                import asyncio
                 from scripts.mcp_servers.sd_mcp_server import generate_image
                 
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                
                 # Test with enhancement enabled
-                result = loop.run_until_complete(
+                result = self.run_async(
                     generate_image(
                         prompt=prompt,
                         enhance_prompt=True,
@@ -3186,8 +3396,7 @@ end tell
                 )
                 
                 # Parse and display results
-                import json
-                generation_data = json.loads(result)
+                generation_data = _json_loads(result)
                 
                 if generation_data.get('status') == 'success':
                     self.log_analysis_message("✅ Enhanced generation completed!")
@@ -3212,7 +3421,6 @@ end tell
                 
             except Exception as e:
                 self.log_analysis_message(f"❌ Enhanced generation failed: {e}")
-                import traceback
                 self.log_analysis_message(f"🔍 Details: {traceback.format_exc()}")
         
         threading.Thread(target=run_enhanced_generation, daemon=True).start()
@@ -3228,11 +3436,11 @@ end tell
         
         def run_local_analysis():
             try:
-                # Test the content database directly
-                from modules.stable_diffusion.content_db import ContentDatabase
-                
-                db = ContentDatabase("modules/stable_diffusion/content_mapping.db")
-                analysis = db.analyze_prompt(prompt)
+                # Test the content database directly, opened once and reused across clicks
+                if self._analysis_db is None:
+                    from modules.stable_diffusion.content_db import ContentDatabase
+                    self._analysis_db = ContentDatabase("modules/stable_diffusion/content_mapping.db")
+                analysis = self._analysis_db.analyze_prompt(prompt)
                 
                 self.log_analysis_message("✅ Local content analysis completed!")
                 self.log_analysis_message(f"📊 Raw analysis results:")
@@ -3266,22 +3474,33 @@ end tell
                 else:
                     self.log_analysis_message("✅ No content flags detected")
                 
-                db.close()
-                
             except Exception as e:
                 self.log_analysis_message(f"❌ Local analysis failed: {e}")
-                import traceback
                 self.log_analysis_message(f"🔍 Details: {traceback.format_exc()}")
         
-        threading.Thread(target=run_local_analysis, daemon=True).start()
+        self._analysis_executor.submit(run_local_analysis)
     
     def log_analysis_message(self, message: str):
         """Log message to content analysis results area"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {message}\n"
-        self.analysis_results.insert(tk.END, formatted_message)
-        self.analysis_results.see(tk.END)
-        self.root.update()
+        self.log_message(message, self.analysis_results)
+    
+    def _close_analysis_db(self):
+        """Close the cached content analysis database (runs on its worker thread)"""
+        if self._analysis_db is not None:
+            self._analysis_db.close()
+            self._analysis_db = None
+    
+    def _on_close(self):
+        """Release long-lived resources, then close the window"""
+        self._analysis_executor.submit(self._close_analysis_db)
+        self._analysis_executor.shutdown(wait=False)
+        closing = self._close_async_client()
+        if closing is not None:
+            try:
+                closing.result(timeout=2)
+            except Exception:
+                pass  # Exiting anyway; don't block the window on a slow close
+        self.root.destroy()
     
     def run(self):
         """Start the GUI application"""
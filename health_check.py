@@ -6,16 +6,16 @@ Health check system for SD MCP Server components
 import asyncio
 import json
 import logging
-import os
 import sys
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, TextIO
 import httpx
 from datetime import datetime
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent))
-from modules.config import load_mcp_environment
+from modules.config import load_mcp_environment, get_service_endpoints
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,25 +25,26 @@ class HealthChecker:
     """Health check system for all components"""
     
     def __init__(self):
-        # Load environment from MCP.json if available
+        # Load environment from MCP.json if available (skipped when the file is unchanged)
         self.load_environment_from_mcp()
+        endpoints = get_service_endpoints()
         
         self.components = {
             'sd_webui': {
                 'name': 'Stable Diffusion WebUI',
-                'url': os.getenv('SD_BASE_URL', 'http://localhost:7860'),
+                'url': endpoints.sd_base_url,
                 'endpoints': ['/sdapi/v1/txt2img', '/sdapi/v1/options'],
                 'critical': True
             },
             'chevereto': {
                 'name': 'Chevereto Image Hosting',
-                'url': os.getenv('CHEVERETO_BASE_URL', ''),
+                'url': endpoints.chevereto_base_url,
                 'endpoints': ['/api/1/upload'],
                 'critical': False
             },
             'mcp_http': {
                 'name': 'MCP HTTP Server',
-                'url': f"http://{os.getenv('MCP_HTTP_HOST', '127.0.0.1')}:{os.getenv('MCP_HTTP_PORT', '8000')}",
+                'url': endpoints.mcp_http_url,
                 'endpoints': ['/health', '/tools/get_models'],
                 'critical': False
             },
@@ -55,7 +56,9 @@ class HealthChecker:
             }
         }
         
-        self.timeout = 10  # seconds
+        self.timeout = 5  # seconds to wait for each response
+        self.connect_timeout = 2  # seconds to establish a connection
+        self.deadline = 8  # seconds for the whole health check
     
     def load_environment_from_mcp(self):
         """Load environment variables from MCP.json using configurable path"""
@@ -73,8 +76,9 @@ class HealthChecker:
             logger.warning(f"⚠️ Could not load MCP.json: {e}")
             logger.info("📝 Using default environment variables")
     
-    async def check_component(self, component_name: str, config: Dict[str, Any]) -> Dict[str, Any]:
-        """Check health of a single component"""
+    async def check_component(self, component_name: str, config: Dict[str, Any],
+                              client: httpx.AsyncClient) -> Dict[str, Any]:
+        """Check health of a single component using the shared HTTP client"""
         result = {
             'name': config['name'],
             'status': 'unknown',
@@ -90,43 +94,45 @@ class HealthChecker:
             return result
         
         try:
-            start_time = datetime.now()
+            start_time = time.perf_counter()
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                # Check main URL
-                response = await client.get(config['url'])
+            # Check main URL
+            response = await client.get(config['url'])
                 
-                response_time = (datetime.now() - start_time).total_seconds()
-                result['response_time'] = response_time
+            response_time = time.perf_counter() - start_time
+            result['response_time'] = response_time
                 
-                if response.status_code == 200 or (response.status_code == 302 and component_name == 'chevereto'):
-                    result['status'] = 'healthy'
-                    result['available'] = True
-                    result['details']['http_status'] = response.status_code
-                    if response.status_code == 302:
-                        result['details']['redirect_note'] = 'Chevereto login redirect (normal)'
+            if response.status_code == 200 or (response.status_code == 302 and component_name == 'chevereto'):
+                result['status'] = 'healthy'
+                result['available'] = True
+                result['details']['http_status'] = response.status_code
+                if response.status_code == 302:
+                    result['details']['redirect_note'] = 'Chevereto login redirect (normal)'
                     
-                    # Check specific endpoints if configured
-                    endpoint_results = {}
-                    for endpoint in config['endpoints']:
-                        try:
-                            ep_response = await client.get(f"{config['url']}{endpoint}")
-                            endpoint_results[endpoint] = {
-                                'status': ep_response.status_code,
-                                'available': ep_response.status_code < 500
-                            }
-                        except Exception as e:
-                            endpoint_results[endpoint] = {
-                                'status': 'error',
-                                'error': str(e),
-                                'available': False
-                            }
+                # Check specific endpoints if configured
+                endpoint_results = {}
+                ep_responses = await asyncio.gather(
+                    *(client.get(f"{config['url']}{endpoint}") for endpoint in config['endpoints']),
+                    return_exceptions=True
+                )
+                for endpoint, ep_response in zip(config['endpoints'], ep_responses):
+                    if isinstance(ep_response, Exception):
+                        endpoint_results[endpoint] = {
+                            'status': 'error',
+                            'error': str(ep_response),
+                            'available': False
+                        }
+                    else:
+                        endpoint_results[endpoint] = {
+                            'status': ep_response.status_code,
+                            'available': ep_response.status_code < 500
+                        }
                     
-                    result['details']['endpoints'] = endpoint_results
-                else:
-                    result['status'] = 'unhealthy'
-                    result['error'] = f"HTTP {response.status_code}"
-                    result['details']['http_status'] = response.status_code
+                result['details']['endpoints'] = endpoint_results
+            else:
+                result['status'] = 'unhealthy'
+                result['error'] = f"HTTP {response.status_code}"
+                result['details']['http_status'] = response.status_code
                     
         except httpx.TimeoutException:
             result['status'] = 'timeout'
@@ -144,22 +150,41 @@ class HealthChecker:
         """Check health of all components"""
         results = {}
         
-        # Check all components concurrently
-        tasks = []
-        for component_name, config in self.components.items():
-            if component_name == 'discord_bot':
-                # Special handling for Discord bot
-                results[component_name] = await self.check_discord_bot()
-            else:
-                tasks.append(self.check_component(component_name, config))
-        
-        # Wait for all HTTP checks to complete
-        component_results = await asyncio.gather(*tasks)
+        # One client for every probe so requests to the same host reuse keep-alive connections
+        async with httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout, pool=1.0),
+            limits=httpx.Limits(max_keepalive_connections=16)
+        ) as client:
+            # Check all components concurrently
+            tasks = {}
+            for component_name, config in self.components.items():
+                if component_name == 'discord_bot':
+                    # Special handling for Discord bot
+                    results[component_name] = await self.check_discord_bot()
+                else:
+                    tasks[component_name] = asyncio.create_task(
+                        self.check_component(component_name, config, client)
+                    )
+            
+            # Wait for the HTTP checks, but never past the overall deadline
+            done, pending = await asyncio.wait(tasks.values(), timeout=self.deadline)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
         
-        # Map results back to component names
-        http_components = [name for name in self.components.keys() if name != 'discord_bot']
-        for i, component_name in enumerate(http_components):
-            results[component_name] = component_results[i]
+        # Map results back to component names; unfinished checks count as timeouts
+        for component_name, task in tasks.items():
+            if task in done:
+                results[component_name] = task.result()
+            else:
+                results[component_name] = {
+                    'name': self.components[component_name]['name'],
+                    'status': 'timeout',
+                    'available': False,
+                    'response_time': None,
+                    'error': f"No result within the {self.deadline}s health check deadline",
+                    'details': {}
+                }
         
         return results
     
@@ -271,10 +296,34 @@ class FailureHandler:
             'fallback': 'Discord bot cannot communicate with SD server'
         }
 
-async def main():
-    """Main health check function"""
-    print("🔍 SD MCP Server Health Check")
-    print("=" * 50)
+# Display icon for each component status
+_STATUS_ICON = {
+    'healthy': '✅',
+    'degraded': '⚠️',
+    'unhealthy': '❌',
+    'unavailable': '🔴',
+    'timeout': '⏱️',
+    'error': '💥',
+    'disabled': '⚫',
+    'unknown': '❓'
+}
+
+# Advice for each component that can fail
+_FAILURE_HANDLERS = {
+    'sd_webui': FailureHandler.handle_sd_unavailable,
+    'chevereto': FailureHandler.handle_chevereto_unavailable,
+    'discord_bot': FailureHandler.handle_discord_unavailable,
+    'mcp_http': FailureHandler.handle_mcp_http_unavailable,
+}
+
+def _default_advice() -> Dict[str, Any]:
+    """Generic advice for components without a dedicated handler"""
+    return {'suggestions': ['Check component configuration']}
+
+async def main(out: Optional[TextIO] = None):
+    """Main health check function; the report goes to out (default: stdout)"""
+    print("🔍 SD MCP Server Health Check", file=out)
+    print("=" * 50, file=out)
     
     health_checker = HealthChecker()
     
@@ -285,58 +334,38 @@ async def main():
     system_status = health_checker.get_system_status(component_results)
     
     # Display results
-    print(f"\n📊 Overall Status: {system_status['overall_status'].upper()}")
-    print(f"✅ Healthy Components: {system_status['healthy_components']}/{system_status['total_components']}")
-    print(f"🔧 Critical Components: {system_status['critical_components_healthy']}/{system_status['critical_components_total']}")
+    print(f"\n📊 Overall Status: {system_status['overall_status'].upper()}", file=out)
+    print(f"✅ Healthy Components: {system_status['healthy_components']}/{system_status['total_components']}", file=out)
+    print(f"🔧 Critical Components: {system_status['critical_components_healthy']}/{system_status['critical_components_total']}", file=out)
     
-    print("\n🔍 Component Details:")
+    print("\n🔍 Component Details:", file=out)
     for component_name, result in component_results.items():
-        status_icon = {
-            'healthy': '✅',
-            'degraded': '⚠️',
-            'unhealthy': '❌',
-            'unavailable': '🔴',
-            'timeout': '⏱️',
-            'error': '💥',
-            'disabled': '⚫',
-            'unknown': '❓'
-        }.get(result['status'], '❓')
+        status_icon = _STATUS_ICON.get(result['status'], '❓')
         
-        print(f"  {status_icon} {result['name']}: {result['status']}")
+        print(f"  {status_icon} {result['name']}: {result['status']}", file=out)
         if result['error']:
-            print(f"    Error: {result['error']}")
+            print(f"    Error: {result['error']}", file=out)
         if result['response_time']:
-            print(f"    Response time: {result['response_time']:.2f}s")
+            print(f"    Response time: {result['response_time']:.2f}s", file=out)
     
     # Show capabilities
-    print("\n🎯 System Capabilities:")
-    print(f"  🎨 Image Generation: {'✅' if system_status['can_generate_images'] else '❌'}")
-    print(f"  📤 Image Upload: {'✅' if system_status['can_upload_images'] else '❌'}")
-    print(f"  🤖 Discord Bot: {'✅' if system_status['can_use_discord'] else '❌'}")
+    print("\n🎯 System Capabilities:", file=out)
+    print(f"  🎨 Image Generation: {'✅' if system_status['can_generate_images'] else '❌'}", file=out)
+    print(f"  📤 Image Upload: {'✅' if system_status['can_upload_images'] else '❌'}", file=out)
+    print(f"  🤖 Discord Bot: {'✅' if system_status['can_use_discord'] else '❌'}", file=out)
     
     # Show failures and suggestions
-    failure_handler = FailureHandler()
-    
     for component_name, result in component_results.items():
         if result['status'] not in ['healthy', 'disabled']:
-            print(f"\n⚠️ {result['name']} Issues:")
+            print(f"\n⚠️ {result['name']} Issues:", file=out)
             
-            if component_name == 'sd_webui':
-                advice = failure_handler.handle_sd_unavailable()
-            elif component_name == 'chevereto':
-                advice = failure_handler.handle_chevereto_unavailable()
-            elif component_name == 'discord_bot':
-                advice = failure_handler.handle_discord_unavailable()
-            elif component_name == 'mcp_http':
-                advice = failure_handler.handle_mcp_http_unavailable()
-            else:
-                advice = {'suggestions': ['Check component configuration']}
+            advice = _FAILURE_HANDLERS.get(component_name, _default_advice)()
             
             for suggestion in advice.get('suggestions', []):
-                print(f"  💡 {suggestion}")
+                print(f"  💡 {suggestion}", file=out)
             
             if 'fallback' in advice:
-                print(f"  🔄 Fallback: {advice['fallback']}")
+                print(f"  🔄 Fallback: {advice['fallback']}", file=out)
     
     # Return status for scripts
     return system_status['overall_status'] == 'healthy'
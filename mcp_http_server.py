@@ -4,76 +4,127 @@ HTTP wrapper for MCP server
 Provides HTTP endpoints for Discord bot to call MCP tools
 """
 
+import atexit
 import asyncio
 import json
 import logging
+import logging.handlers
 import os
+import re
 import sys
+import queue
 from pathlib import Path
 from typing import Dict, Any
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
+from fastapi.responses import FileResponse, JSONResponse
+from pydantic import BaseModel, ConfigDict, Field
 import uvicorn
 
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add project root to path
 sys.path.append(str(Path(__file__).parent))
 
+from modules.config import get_service_endpoints
+
 # Import MCP server functions
+from scripts.mcp_servers import sd_mcp_server
 from scripts.mcp_servers.sd_mcp_server import (
     generate_image, get_models, load_checkpoint, get_current_model,
     search_loras, get_queue_status, upload_image, start_guided_generation,
     _initialize_components
 )
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging: request handlers only enqueue records, and a listener thread
+# formats them and writes to stderr. force=True replaces the plain StreamHandler the
+# MCP server module installs on import.
+_log_queue = queue.SimpleQueue()
+logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(_log_queue)], force=True)
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))  # LEVEL:name:message, as before
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger('MCP_HTTP_Server')
 
-# Create FastAPI app
+# Create FastAPI app (orjson serializes responses when installed)
 app = FastAPI(
     title="SD MCP Server HTTP API",
     description="HTTP wrapper for Stable Diffusion MCP Server",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
 )
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+def _parse_tool_result(result):
+    """MCP tools return JSON strings; decode them for the response"""
+    if isinstance(result, str):
+        return _json_loads(result)
+    return result
+
+# CORS only matters for browser clients; the Discord bot calls this API directly.
+# Set MCP_HTTP_CORS_ORIGINS to a comma-separated origin list to allow browser access.
+_cors_origins = [origin.strip() for origin in os.getenv("MCP_HTTP_CORS_ORIGINS", "").split(",") if origin.strip()]
+if _cors_origins:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=_cors_origins,
+        allow_credentials=True,
+        allow_methods=["GET", "POST"],
+        allow_headers=["content-type"],
+    )
+
+# Static file serving for uploaded images (directory resolved once at import)
+_UPLOAD_DIR = Path("/tmp/uploaded_images").resolve()
+_IMAGE_NAME_RE = re.compile(r"[A-Za-z0-9._-]+")
 
-# Static file serving for uploaded images
 @app.get("/images/{filename}")
 async def serve_image(filename: str):
     """Serve uploaded images from local storage"""
-    upload_dir = Path("/tmp/uploaded_images")
-    file_path = upload_dir / filename
-    
-    if not file_path.exists():
+    # Stored names are hashes/UUIDs with a few separators; reject anything else without touching disk
+    if not _IMAGE_NAME_RE.fullmatch(filename):
         raise HTTPException(status_code=404, detail="Image not found")
     
     # Security check: ensure file is within upload directory
+    file_path = (_UPLOAD_DIR / filename).resolve()
     try:
-        file_path.resolve().relative_to(upload_dir.resolve())
+        file_path.relative_to(_UPLOAD_DIR)
     except ValueError:
         raise HTTPException(status_code=403, detail="Access denied")
     
+    # Stat once off the event loop; FileResponse reuses the result instead of stat-ing again
+    try:
+        stat_result = await asyncio.to_thread(file_path.stat)
+    except OSError:
+        raise HTTPException(status_code=404, detail="Image not found")
+    
+    # Stored names carry a content hash, so clients can cache them indefinitely
     return FileResponse(
         path=str(file_path),
         media_type="image/png",
-        headers={"Cache-Control": "public, max-age=3600"}
+        stat_result=stat_result,
+        headers={"Cache-Control": "public, max-age=86400, immutable"}
     )
 
+# Upper bound on prompt length so oversized bodies are rejected early
+_MAX_PROMPT_LENGTH = 4096
+
 # Request models
-class GenerateImageRequest(BaseModel):
-    prompt: str
+class _RequestModel(BaseModel):
+    """Base for request bodies: unknown fields are dropped and instances are read-only"""
+    model_config = ConfigDict(extra='ignore', frozen=True, protected_namespaces=())
+
+class GenerateImageRequest(_RequestModel):
+    prompt: str = Field(max_length=_MAX_PROMPT_LENGTH)
     negative_prompt: str = ""
     steps: int = 25
     width: int = 1024
@@ -85,36 +136,70 @@ class GenerateImageRequest(BaseModel):
     user_id: str = ""
     album_name: str = ""
 
-class LoadCheckpointRequest(BaseModel):
+class LoadCheckpointRequest(_RequestModel):
     model_name: str
 
-class SearchLorasRequest(BaseModel):
+class SearchLorasRequest(_RequestModel):
     query: str
     limit: int = 10
 
-class UploadImageRequest(BaseModel):
+class UploadImageRequest(_RequestModel):
     image_path: str
     user_id: str = ""
     album_name: str = ""
 
-class GuidedGenerationRequest(BaseModel):
-    prompt: str
+class GuidedGenerationRequest(_RequestModel):
+    prompt: str = Field(max_length=_MAX_PROMPT_LENGTH)
 
-# Initialize components on startup
+# Initialize components on startup, in the background so the server accepts traffic immediately
 @app.on_event("startup")
 async def startup_event():
-    """Initialize MCP components"""
+    """Start MCP component initialization"""
     logger.info("🚀 Starting MCP HTTP Server...")
+    app.state.ready = False
+    app.state.init_error = None
+    app.state.init_task = asyncio.create_task(_initialize_in_background())
+
+async def _initialize_in_background():
+    """Run the blocking component setup in a worker thread, then start the LoRA sync on the loop"""
     try:
-        _initialize_components()
-        logger.info("✅ MCP components initialized")
+        await asyncio.to_thread(_initialize_components)
     except Exception as e:
         logger.error(f"❌ Failed to initialize MCP components: {e}")
+        # Reported by /health; tools still retry initialization lazily
+        app.state.init_error = str(e)
+    else:
+        logger.info("✅ MCP components initialized")
+        # LoRAManager found no running loop in the worker thread, so schedule its sync here
+        lora_manager = sd_mcp_server._lora_manager
+        if lora_manager is not None and lora_manager.auto_sync:
+            lora_manager.start_auto_sync()
+    app.state.ready = True
+
+async def _components_ready():
+    """Wait for background initialization before calling MCP tools"""
+    init_task = getattr(app.state, "init_task", None)
+    if init_task is not None and not init_task.done():
+        await asyncio.shield(init_task)
 
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    if not getattr(app.state, "ready", True):
+        return JSONResponse(
+            status_code=503,
+            content={"status": "initializing", "service": "SD MCP Server HTTP API"}
+        )
+    init_error = getattr(app.state, "init_error", None)
+    if init_error and sd_mcp_server._components_initialized:
+        # A tool call has since initialized the components lazily
+        app.state.init_error = init_error = None
+    if init_error:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "error", "service": "SD MCP Server HTTP API", "error": init_error}
+        )
     return {"status": "healthy", "service": "SD MCP Server HTTP API"}
 
 # MCP tool endpoints
@@ -122,6 +207,7 @@ async def health_check():
 async def generate_image_endpoint(request: GenerateImageRequest):
     """Generate image via MCP server"""
     try:
+        await _components_ready()
         logger.info(f"🎨 Generating image: {request.prompt[:50]}...")
         
         result = await generate_image(
@@ -139,8 +225,7 @@ async def generate_image_endpoint(request: GenerateImageRequest):
         )
         
         # Parse JSON response from MCP server
-        if isinstance(result, str):
-            result = json.loads(result)
+        result = _parse_tool_result(result)
         
         logger.info(f"✅ Generation completed: {result.get('status', 'unknown')}")
         return result
@@ -153,9 +238,9 @@ async def generate_image_endpoint(request: GenerateImageRequest):
 async def get_models_endpoint():
     """Get available models"""
     try:
+        await _components_ready()
         result = await get_models()
-        if isinstance(result, str):
-            result = json.loads(result)
+        result = _parse_tool_result(result)
         return result
     except Exception as e:
         logger.error(f"❌ Failed to get models: {e}")
@@ -165,10 +250,10 @@ async def get_models_endpoint():
 async def load_checkpoint_endpoint(request: LoadCheckpointRequest):
     """Load model checkpoint"""
     try:
+        await _components_ready()
         logger.info(f"🔄 Loading checkpoint: {request.model_name}")
         result = await load_checkpoint(request.model_name)
-        if isinstance(result, str):
-            result = json.loads(result)
+        result = _parse_tool_result(result)
         return result
     except Exception as e:
         logger.error(f"❌ Failed to load checkpoint: {e}")
@@ -178,9 +263,9 @@ async def load_checkpoint_endpoint(request: LoadCheckpointRequest):
 async def get_current_model_endpoint():
     """Get current model"""
     try:
+        await _components_ready()
         result = await get_current_model()
-        if isinstance(result, str):
-            result = json.loads(result)
+        result = _parse_tool_result(result)
         return result
     except Exception as e:
         logger.error(f"❌ Failed to get current model: {e}")
@@ -190,9 +275,9 @@ async def get_current_model_endpoint():
 async def search_loras_endpoint(request: SearchLorasRequest):
     """Search LoRA models"""
     try:
+        await _components_ready()
         result = await search_loras(request.query, request.limit)
-        if isinstance(result, str):
-            result = json.loads(result)
+        result = _parse_tool_result(result)
         return result
     except Exception as e:
         logger.error(f"❌ Failed to search LoRAs: {e}")
@@ -202,9 +287,9 @@ async def search_loras_endpoint(request: SearchLorasRequest):
 async def get_queue_status_endpoint():
     """Get queue status"""
     try:
+        await _components_ready()
         result = await get_queue_status()
-        if isinstance(result, str):
-            result = json.loads(result)
+        result = _parse_tool_result(result)
         return result
     except Exception as e:
         logger.error(f"❌ Failed to get queue status: {e}")
@@ -214,9 +299,9 @@ async def get_queue_status_endpoint():
 async def upload_image_endpoint(request: UploadImageRequest):
     """Upload image"""
     try:
+        await _components_ready()
         result = await upload_image(request.image_path, request.user_id, request.album_name)
-        if isinstance(result, str):
-            result = json.loads(result)
+        result = _parse_tool_result(result)
         return result
     except Exception as e:
         logger.error(f"❌ Failed to upload image: {e}")
@@ -226,9 +311,9 @@ async def upload_image_endpoint(request: UploadImageRequest):
 async def start_guided_generation_endpoint(request: GuidedGenerationRequest):
     """Start guided generation"""
     try:
+        await _components_ready()
         result = await start_guided_generation(request.prompt)
-        if isinstance(result, str):
-            result = json.loads(result)
+        result = _parse_tool_result(result)
         return result
     except Exception as e:
         logger.error(f"❌ Failed to start guided generation: {e}")
@@ -259,18 +344,25 @@ async def server_info():
 def main():
     """Main server runner"""
     # Get configuration from environment
-    host = os.getenv("MCP_HTTP_HOST", "127.0.0.1")
-    port = int(os.getenv("MCP_HTTP_PORT", "8000"))
+    endpoints = get_service_endpoints()
+    host = endpoints.mcp_http_host
+    port = endpoints.mcp_http_port
     
     logger.info(f"🚀 Starting MCP HTTP Server on {host}:{port}")
     
     try:
+        # loop/http "auto" pick uvloop and httptools whenever they are installed
         uvicorn.run(
             app,
             host=host,
             port=port,
-            log_level="info",
-            reload=False
+            log_level="warning",
+            access_log=False,
+            loop="auto",
+            http="auto",
+            reload=False,
+            server_header=False,
+            date_header=False
         )
     except Exception as e:
         logger.error(f"❌ Server failed to start: {e}")
@@ -5,6 +5,10 @@ Provides centralized configuration management, including MCP.json path handling
 and environment variable loading.
 """
 
-from .mcp_config import MCPConfig, get_mcp_config, load_mcp_environment
+from .mcp_config import (
+    MCPConfig, ServiceEndpoints, get_mcp_config, get_service_endpoints, load_mcp_environment,
+    read_mcp_json, refresh_path_caches
+)
 
-__all__ = ['MCPConfig', 'get_mcp_config', 'load_mcp_environment']
\ No newline at end of file
+__all__ = ['MCPConfig', 'ServiceEndpoints', 'get_mcp_config', 'get_service_endpoints', 'load_mcp_environment',
+           'read_mcp_json', 'refresh_path_caches']
\ No newline at end of file
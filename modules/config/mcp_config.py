@@ -9,11 +9,28 @@ Provides a single source of truth for MCP.json location across the entire codeba
 import os
 import json
 import logging
+import functools
+import stat
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Both parsers accept bytes; orjson.JSONDecodeError subclasses json.JSONDecodeError
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Parsed MCP.json contents keyed by (resolved path, mtime_ns, size)
+_PARSE_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
 class MCPConfig:
     """
     Centralized MCP.json configuration manager
@@ -30,6 +47,8 @@ class MCPConfig:
             custom_path: Optional custom path to MCP.json file
         """
         self._mcp_path: Optional[Path] = None
+        self._stat: Optional[os.stat_result] = None
+        self._applied_key: Optional[Tuple[str, int, int]] = None  # File version last put into os.environ
         self._env_vars: Dict[str, str] = {}
         self._loaded = False
         
@@ -44,9 +63,10 @@ class MCPConfig:
         return self._mcp_path
     
     @property
-    def env_vars(self) -> Dict[str, str]:
-        """Get loaded environment variables"""
-        return self._env_vars.copy()
+    def env_vars(self) -> Mapping[str, str]:
+        """Get loaded environment variables as a read-only view"""
+        # load_config replaces the dict rather than mutating it, so a view keeps its snapshot
+        return MappingProxyType(self._env_vars)
     
     @property
     def is_loaded(self) -> bool:
@@ -65,44 +85,37 @@ class MCPConfig:
         """
         try:
             mcp_path = Path(path)
-            if mcp_path.exists() and mcp_path.is_file():
+            st = _regular_file_stat(mcp_path)
+            if st is not None:
                 self._mcp_path = mcp_path
+                self._stat = st
                 self._loaded = False  # Reset loaded status
-                logger.info(f"MCP.json path set to: {mcp_path}")
+                logger.info("MCP.json path set to: %s", mcp_path)
                 return True
             else:
-                logger.warning(f"MCP.json path does not exist: {mcp_path}")
+                logger.warning("MCP.json path does not exist: %s", mcp_path)
                 return False
         except Exception as e:
-            logger.error(f"Error setting MCP.json path: {e}")
+            logger.error("Error setting MCP.json path: %s", e)
             return False
     
-    def get_common_mcp_paths(self) -> List[Path]:
+    @staticmethod
+    def get_common_mcp_paths() -> Tuple[Path, ...]:
         """
-        Get list of common MCP.json file locations
+        Get common MCP.json file locations
+        
+        MCP_JSON_PATH is not included; auto_detect_mcp_path checks it first.
         
         Returns:
-            List[Path]: Common paths where MCP.json might be located
+            Tuple[Path, ...]: Common paths where MCP.json might be located
         """
-        home = Path.home()
+        cwd = _cwd()
         
-        return [
-            # LM Studio default locations
-            home / ".cache" / "lm-studio" / "mcp.json",  # Linux/macOS default
-            home / "AppData" / "Roaming" / "LM Studio" / "mcp.json",  # Windows
-            home / "Library" / "Application Support" / "LM Studio" / "mcp.json",  # macOS alternative
-            home / ".config" / "lm-studio" / "mcp.json",  # Linux alternative
-            
+        return _lm_studio_mcp_paths() + (
             # Development/local locations
-            Path.cwd() / "mcp.json",  # Current working directory
-            Path.cwd().parent / "mcp.json",  # Parent directory
-            
-            # Environment variable override
-            Path(os.getenv("MCP_JSON_PATH", "/nonexistent")),
-            
-            # User-specific path from CLAUDE.md (if it exists)
-            Path("/Users/nickchamberlain/.cache/lm-studio/mcp.json"),
-        ]
+            cwd / "mcp.json",  # Current working directory
+            cwd.parent / "mcp.json",  # Parent directory
+        )
     
     def auto_detect_mcp_path(self) -> bool:
         """
@@ -116,16 +129,18 @@ class MCPConfig:
         # Check environment variable first
         env_path = os.getenv("MCP_JSON_PATH")
         if env_path:
-            logger.info(f"Using MCP_JSON_PATH environment variable: {env_path}")
+            logger.info("Using MCP_JSON_PATH environment variable: %s", env_path)
             if self.set_mcp_path(env_path):
                 return True
         
-        # Check common locations
-        for path in self.get_common_mcp_paths():
-            if path.exists() and path.is_file():
-                logger.info(f"Found MCP.json at: {path}")
-                self._mcp_path = path
-                return True
+        # Check common locations (searched once per process)
+        found = _detect_default_path()
+        if found:
+            path, st = found
+            logger.info("Found MCP.json at: %s", path)
+            self._mcp_path = path
+            self._stat = st
+            return True
         
         logger.warning("No MCP.json file found in common locations")
         logger.info("Set MCP_JSON_PATH environment variable or use custom path")
@@ -143,16 +158,19 @@ class MCPConfig:
             return False
         
         try:
-            with open(self._mcp_path, 'r') as f:
-                mcp_config = json.load(f)
+            st = os.stat(self._mcp_path)
+            self._stat = st
+            mcp_config = read_mcp_json(self._mcp_path, st)
             
             # Extract SD_MCP_Server environment variables
-            sd_server = mcp_config.get("mcpServers", {}).get("SD_MCP_Server", {})
-            env_vars = sd_server.get("env", {})
+            try:
+                env_vars = mcp_config["mcpServers"]["SD_MCP_Server"]["env"]
+            except (KeyError, TypeError):
+                env_vars = {}
             
             if env_vars:
-                self._env_vars = {k: str(v) for k, v in env_vars.items()}
-                logger.info(f"Loaded {len(self._env_vars)} environment variables from MCP.json")
+                self._env_vars = {k: v if type(v) is str else str(v) for k, v in env_vars.items()}
+                logger.info("Loaded %d environment variables from MCP.json", len(self._env_vars))
                 self._loaded = True
                 return True
             else:
@@ -160,13 +178,14 @@ class MCPConfig:
                 return False
                 
         except FileNotFoundError:
-            logger.error(f"MCP.json file not found: {self._mcp_path}")
+            self._stat = None
+            logger.error("MCP.json file not found: %s", self._mcp_path)
             return False
         except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in MCP.json: {e}")
+            logger.error("Invalid JSON in MCP.json: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Error loading MCP.json: {e}")
+            logger.error("Error loading MCP.json: %s", e)
             return False
     
     def load_into_environment(self) -> bool:
@@ -176,16 +195,42 @@ class MCPConfig:
         Returns:
             bool: True if environment variables were set successfully
         """
+        # Nothing to do if this exact file version is already in the environment
+        if self._applied_key is not None and self._applied_key == self._file_key():
+            return True
+        
         if not self.load_config():
             return False
         
         # Set environment variables
-        for key, value in self._env_vars.items():
-            os.environ[key] = value
+        os.environ.update(self._env_vars)
+        get_service_endpoints.cache_clear()
+        self._applied_key = self._file_key(self._stat)
         
-        logger.info(f"Set {len(self._env_vars)} environment variables from MCP.json")
+        logger.info("Set %d environment variables from MCP.json", len(self._env_vars))
         return True
     
+    def _file_key(self, st: Optional[os.stat_result] = None) -> Optional[Tuple[str, int, int]]:
+        """Identify the current MCP.json version by (path, mtime_ns, size), stat'ing if needed"""
+        if not self._mcp_path:
+            return None
+        if st is None:
+            try:
+                st = os.stat(self._mcp_path)
+            except OSError:
+                return None
+        return (str(self._mcp_path), st.st_mtime_ns, st.st_size)
+    
+    def refresh_stat(self) -> bool:
+        """
+        Re-stat the configured MCP.json file
+        
+        Returns:
+            bool: True if the file currently exists as a regular file
+        """
+        self._stat = _regular_file_stat(self._mcp_path) if self._mcp_path else None
+        return self._stat is not None
+    
     def get_config_summary(self) -> Dict[str, Any]:
         """
         Get summary of current configuration
@@ -195,15 +240,105 @@ class MCPConfig:
         """
         return {
             "mcp_path": str(self._mcp_path) if self._mcp_path else None,
-            "mcp_exists": self._mcp_path.exists() if self._mcp_path else False,
+            "mcp_exists": self._stat is not None,  # From the last stat; see refresh_stat()
             "loaded": self._loaded,
             "env_var_count": len(self._env_vars),
             "env_vars": list(self._env_vars.keys()) if self._env_vars else []
         }
 
 
+def read_mcp_json(path: Path, st: Optional[os.stat_result] = None) -> Dict[str, Any]:
+    """
+    Parse an MCP.json file, reusing the previous result while the file is unchanged
+    
+    The returned dict is shared between callers and must not be modified.
+    
+    Args:
+        path: Path to the MCP.json file
+        st: Optional stat result for path, to avoid stat'ing it again
+        
+    Returns:
+        Dict[str, Any]: Parsed MCP.json contents
+    """
+    if st is None:
+        st = os.stat(path)
+    path_key = str(path.resolve())
+    key = (path_key, st.st_mtime_ns, st.st_size)
+    cached = _PARSE_CACHE.get(key)
+    if cached is not None:
+        return cached
+    
+    with open(path, 'rb') as f:
+        data = f.read()
+    mcp_config = _json_loads(data)
+    
+    # Keep only the latest version of each file
+    for stale in [k for k in _PARSE_CACHE if k[0] == path_key]:
+        del _PARSE_CACHE[stale]
+    _PARSE_CACHE[key] = mcp_config
+    return mcp_config
+
+def _regular_file_stat(path: Path) -> Optional[os.stat_result]:
+    """Stat a path once, returning the result only for regular files"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+@functools.cache
+def _cwd() -> Path:
+    """Working directory at first use; see refresh_path_caches()"""
+    return Path.cwd()
+
+@functools.cache
+def _lm_studio_mcp_paths() -> Tuple[Path, ...]:
+    """LM Studio's default MCP.json locations, built once per process"""
+    home = Path.home()
+    
+    return (
+        home / ".cache" / "lm-studio" / "mcp.json",  # Linux/macOS default
+        home / "AppData" / "Roaming" / "LM Studio" / "mcp.json",  # Windows
+        home / "Library" / "Application Support" / "LM Studio" / "mcp.json",  # macOS alternative
+        home / ".config" / "lm-studio" / "mcp.json",  # Linux alternative
+    )
+
+# First MCP.json found among the common locations; misses are not cached
+_detected_default_path: Optional[Tuple[Path, os.stat_result]] = None
+
+def _detect_default_path() -> Optional[Tuple[Path, os.stat_result]]:
+    """
+    Find the first existing MCP.json among the common locations
+    
+    A found file is remembered for later calls; when nothing is found the
+    search runs again next time, so a file created later is picked up.
+    
+    Returns:
+        Optional[Tuple[Path, os.stat_result]]: Detected path and its stat result
+    """
+    global _detected_default_path
+    
+    if _detected_default_path is None:
+        for path in MCPConfig.get_common_mcp_paths():
+            st = _regular_file_stat(path)
+            if st is not None:
+                _detected_default_path = (path, st)
+                break
+    return _detected_default_path
+
+def refresh_path_caches() -> None:
+    """Forget the cached home/working directory and detected MCP.json location"""
+    global _detected_default_path
+    
+    _cwd.cache_clear()
+    _lm_studio_mcp_paths.cache_clear()
+    _detected_default_path = None
+
+
 # Global instance for easy access
 _global_mcp_config: Optional[MCPConfig] = None
+_global_mcp_custom_path: Optional[str] = None
+_global_mcp_lock = threading.Lock()
 
 def get_mcp_config(custom_path: Optional[str] = None) -> MCPConfig:
     """
@@ -215,17 +350,28 @@ def get_mcp_config(custom_path: Optional[str] = None) -> MCPConfig:
     Returns:
         MCPConfig: Global configuration instance
     """
-    global _global_mcp_config
+    global _global_mcp_config, _global_mcp_custom_path
     
-    if _global_mcp_config is None or custom_path:
-        _global_mcp_config = MCPConfig(custom_path)
+    # Fast path without the lock once the instance exists
+    config = _global_mcp_config
+    if config is not None and (not custom_path or custom_path == _global_mcp_custom_path):
+        return config
     
-    return _global_mcp_config
+    with _global_mcp_lock:
+        # Only rebuild when a different custom path is requested
+        if _global_mcp_config is None or (custom_path and custom_path != _global_mcp_custom_path):
+            _global_mcp_config = MCPConfig(custom_path)
+            _global_mcp_custom_path = custom_path
+        
+        return _global_mcp_config
 
 def load_mcp_environment(custom_path: Optional[str] = None) -> bool:
     """
     Convenience function to load MCP.json into environment variables
     
+    Repeated calls only re-stat MCP.json; an unchanged file is not parsed
+    or applied again.
+    
     Args:
         custom_path: Optional custom path to MCP.json file
         
@@ -233,4 +379,34 @@ def load_mcp_environment(custom_path: Optional[str] = None) -> bool:
         bool: True if environment variables were loaded successfully
     """
     config = get_mcp_config(custom_path)
-    return config.load_into_environment()
\ No newline at end of file
+    return config.load_into_environment()
+
+@dataclass(frozen=True)
+class ServiceEndpoints:
+    """Service addresses resolved from the environment"""
+    sd_base_url: str
+    chevereto_base_url: str
+    mcp_http_host: str
+    mcp_http_port: int
+    
+    @property
+    def mcp_http_url(self) -> str:
+        """Base URL of the MCP HTTP server"""
+        return f"http://{self.mcp_http_host}:{self.mcp_http_port}"
+
+@functools.lru_cache(maxsize=1)
+def get_service_endpoints() -> ServiceEndpoints:
+    """
+    Get service addresses from the environment, parsed once
+    
+    The cache is cleared whenever MCP.json is loaded into the environment.
+    
+    Returns:
+        ServiceEndpoints: Frozen snapshot of the service configuration
+    """
+    return ServiceEndpoints(
+        sd_base_url=os.getenv('SD_BASE_URL', 'http://localhost:7860'),
+        chevereto_base_url=os.getenv('CHEVERETO_BASE_URL', ''),
+        mcp_http_host=os.getenv('MCP_HTTP_HOST', '127.0.0.1'),
+        mcp_http_port=int(os.getenv('MCP_HTTP_PORT', '8000'))
+    )
@@ -4,7 +4,7 @@ Abstract base class that all LLM providers must implement
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, AsyncGenerator
+from typing import List, Dict, Any, Optional, AsyncGenerator, ClassVar
 from dataclasses import dataclass
 from enum import Enum
 
@@ -13,14 +13,17 @@ class MessageRole(Enum):
     USER = "user" 
     ASSISTANT = "assistant"
 
-@dataclass
+# Role strings for provider payloads, avoiding an Enum .value lookup per message
+ROLE_STR: Dict[MessageRole, str] = {role: role.value for role in MessageRole}
+
+@dataclass(slots=True)
 class LLMMessage:
     """Standardized message format for all LLM providers"""
     role: MessageRole
     content: str
     metadata: Optional[Dict[str, Any]] = None
 
-@dataclass 
+@dataclass(slots=True, frozen=True)
 class LLMResponse:
     """Standardized response format for all LLM providers"""
     content: str
@@ -34,9 +37,15 @@ class LLMResponse:
 class BaseLLMProvider(ABC):
     """Abstract base class for all LLM providers"""
     
+    provider_name: ClassVar[str] = "base"
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Derived once per class, e.g. LMStudioProvider -> "lmstudio"
+        cls.provider_name = cls.__name__.removesuffix('Provider').lower()
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
-        self.provider_name = self.__class__.__name__.replace('Provider', '').lower()
     
     @abstractmethod
     async def chat(
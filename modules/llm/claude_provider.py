@@ -3,12 +3,19 @@ Claude (Anthropic) Provider - MINIMAL STUB FOR USER CONFIGURATION
 Users must add their own API key and customize as needed
 """
 
-from typing import List, Dict, Any, Optional, AsyncGenerator
+from typing import List, Dict, Any, Optional, AsyncGenerator, Tuple
 from .base_provider import BaseLLMProvider, LLMMessage, LLMResponse, MessageRole
 
 # TODO: Users should install anthropic package: pip install anthropic
 # from anthropic import AsyncAnthropic
 
+# Static model list, built once at import
+_CLAUDE_MODELS: Tuple[Dict[str, str], ...] = (
+    {"id": "claude-3-5-sonnet-20241022", "name": "Claude 3.5 Sonnet"},
+    {"id": "claude-3-opus-20240229", "name": "Claude 3 Opus"},
+    {"id": "claude-3-haiku-20240307", "name": "Claude 3 Haiku"},
+)
+
 class ClaudeProvider(BaseLLMProvider):
     """Claude (Anthropic) provider - USER MUST CONFIGURE"""
     
@@ -25,6 +32,9 @@ class ClaudeProvider(BaseLLMProvider):
         
         if not self.api_key:
             raise ValueError("CLAUDE_API_KEY is required in MCP configuration")
+        
+        # Request fields shared by every call; chat() merges per-call values on top
+        self._base_request = {"model": self.default_model_name, "max_tokens": self.max_tokens}
     
     async def chat(self, messages: List[LLMMessage], max_tokens: Optional[int] = None, temperature: Optional[float] = None, **kwargs) -> LLMResponse:
         """TODO: Implement Claude chat completion"""
@@ -32,21 +42,22 @@ class ClaudeProvider(BaseLLMProvider):
         # client = AsyncAnthropic(api_key=self.api_key)
         # 
         # # Convert messages - Claude has different format for system messages
-        # system_message = None
-        # chat_messages = []
-        # for msg in messages:
-        #     if msg.role == MessageRole.SYSTEM:
-        #         system_message = msg.content
-        #     else:
-        #         chat_messages.append({"role": msg.role.value, "content": msg.content})
+        # system_message = next((m.content for m in messages if m.role is MessageRole.SYSTEM), None)
+        # chat_messages = [{"role": ROLE_STR[m.role], "content": m.content}
+        #                  for m in messages if m.role is not MessageRole.SYSTEM]
+        #
+        # # Only send optional fields that are set - the API rejects None for some of them
+        # request = self._base_request | {"messages": chat_messages}
+        # if "model" in kwargs:
+        #     request["model"] = kwargs["model"]
+        # if max_tokens:
+        #     request["max_tokens"] = max_tokens
+        # if temperature is not None:
+        #     request["temperature"] = temperature
+        # if system_message is not None:
+        #     request["system"] = system_message
         #
-        # response = await client.messages.create(
-        #     model=kwargs.get("model", self.default_model_name),
-        #     max_tokens=max_tokens or self.max_tokens,
-        #     temperature=temperature,
-        #     system=system_message,
-        #     messages=chat_messages
-        # )
+        # response = await client.messages.create(**request)
         # return LLMResponse(...)
         
         return LLMResponse(
@@ -63,11 +74,7 @@ class ClaudeProvider(BaseLLMProvider):
     async def get_models(self) -> List[Dict[str, Any]]:
         """TODO: Implement Claude model listing"""
         # Claude doesn't have a models endpoint, return static list
-        return [
-            {"id": "claude-3-5-sonnet-20241022", "name": "Claude 3.5 Sonnet"},
-            {"id": "claude-3-opus-20240229", "name": "Claude 3 Opus"},
-            {"id": "claude-3-haiku-20240307", "name": "Claude 3 Haiku"}
-        ]
+        return list(_CLAUDE_MODELS)
     
     async def health_check(self) -> bool:
         """TODO: Implement Claude health check"""
@@ -7,7 +7,10 @@ import httpx
 import json
 import asyncio
 from typing import List, Dict, Any, Optional, AsyncGenerator
-from .base_provider import BaseLLMProvider, LLMMessage, LLMResponse, MessageRole
+from .base_provider import BaseLLMProvider, LLMMessage, LLMResponse, MessageRole, ROLE_STR
+
+# Extra sampling parameters forwarded from chat() kwargs to LM Studio
+_PASSTHROUGH_PARAMS = ("top_p", "frequency_penalty", "presence_penalty")
 
 class LMStudioProvider(BaseLLMProvider):
     """LM Studio LLM provider implementation - COMPLETE"""
@@ -30,7 +33,7 @@ class LMStudioProvider(BaseLLMProvider):
         try:
             # Convert our message format to OpenAI format
             openai_messages = [
-                {"role": msg.role.value, "content": msg.content}
+                {"role": ROLE_STR[msg.role], "content": msg.content}
                 for msg in messages
             ]
             
@@ -47,13 +50,9 @@ class LMStudioProvider(BaseLLMProvider):
             if temperature is not None:
                 payload["temperature"] = temperature
                 
-            # Add any additional LM Studio specific parameters
-            if "top_p" in kwargs:
-                payload["top_p"] = kwargs["top_p"]
-            if "frequency_penalty" in kwargs:
-                payload["frequency_penalty"] = kwargs["frequency_penalty"]
-            if "presence_penalty" in kwargs:
-                payload["presence_penalty"] = kwargs["presence_penalty"]
+            # Add any additional LM Studio specific parameters (most calls pass none)
+            if kwargs:
+                payload.update({key: kwargs[key] for key in _PASSTHROUGH_PARAMS if key in kwargs})
             
             async with httpx.AsyncClient(timeout=self.timeout) as client:
                 response = await client.post(
@@ -117,7 +116,7 @@ class LMStudioProvider(BaseLLMProvider):
         try:
             # Convert our message format to OpenAI format
             openai_messages = [
-                {"role": msg.role.value, "content": msg.content}
+                {"role": ROLE_STR[msg.role], "content": msg.content}
                 for msg in messages
             ]
             
@@ -32,7 +32,7 @@ class OpenAIProvider(BaseLLMProvider):
         # client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
         # response = await client.chat.completions.create(
         #     model=kwargs.get("model", self.default_model_name),
-        #     messages=[{"role": msg.role.value, "content": msg.content} for msg in messages],
+        #     messages=[{"role": ROLE_STR[msg.role], "content": msg.content} for msg in messages],
         #     max_tokens=max_tokens,
         #     temperature=temperature
         # )
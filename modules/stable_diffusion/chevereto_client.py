@@ -494,6 +494,7 @@ class CheveretoClient:
                             return {
                                 "success": False,
                                 "error": result.get("error", {}).get("message", "Unknown API error"),
+                                "status_code": result.get("status_code"),
                                 "full_response": result
                             }
                     else:
@@ -50,15 +50,16 @@ class Category:
 class ContentDatabase:
     """SQLite-based content classification and mapping system"""
     
-    def __init__(self, db_path: str = "content_mapping.db"):
+    def __init__(self, db_path: str = "content_mapping.db", check_same_thread: bool = True):
         self.db_path = db_path
+        self.check_same_thread = check_same_thread
         self.conn = None
         self._init_database()
         self._populate_initial_data()
     
     def _init_database(self):
         """Initialize SQLite database with schema"""
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=self.check_same_thread)
         self.conn.row_factory = sqlite3.Row
         
         # Enable foreign keys
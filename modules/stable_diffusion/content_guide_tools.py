@@ -10,8 +10,8 @@ from .content_db import ContentDatabase, CategoryType
 class ContentGuideManager:
     """Manager for content guides with MCP tool integration"""
     
-    def __init__(self, db_path: str = "content_mapping.db"):
-        self.db = ContentDatabase(db_path)
+    def __init__(self, db_path: str = "content_mapping.db", check_same_thread: bool = True):
+        self.db = ContentDatabase(db_path, check_same_thread=check_same_thread)
         self.safety_level = "safe"  # Can be configured
     
     def analyze_prompt_detailed(self, prompt: str) -> Dict[str, Any]:
@@ -13,14 +13,22 @@ class LoRAManager:
         self._init_database()
         
         # Auto-sync on initialization if enabled
+        self._sync_task = None
         if self.auto_sync:
-            import asyncio
-            try:
-                # Try to sync in the background
-                asyncio.create_task(self._auto_sync_on_init())
-            except:
-                # If we can't create a task, defer sync to first search
-                pass
+            self.start_auto_sync()
+    
+    def start_auto_sync(self) -> bool:
+        """Schedule the background sync on this thread's running loop, if there is one"""
+        import asyncio
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop on this thread, defer sync to first search
+            return False
+        
+        # Keep a reference so the task isn't collected
+        self._sync_task = loop.create_task(self._auto_sync_on_init())
+        return True
     
     def _init_database(self):
         """Initialize SQLite database for LoRA metadata with smart caching"""
@@ -267,6 +275,11 @@ class LoRAManager:
                 metadata=metadata
             )
     
+    def count(self) -> int:
+        """Get the number of LoRAs in the database"""
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM loras").fetchone()[0]
+    
     def search_loras(self, query: str, category: Optional[str] = None) -> List[LoRAInfo]:
         """Search LoRAs by name, trigger words, or description"""
         with sqlite3.connect(self.db_path) as conn:
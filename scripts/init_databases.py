@@ -9,6 +9,7 @@ import sys
 import sqlite3
 import logging
 from pathlib import Path
+from typing import Optional
 from datetime import datetime
 
 # Add project root to path
@@ -20,9 +21,9 @@ from modules.stable_diffusion.content_db import ContentDatabase
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def create_chevereto_users_db():
-    """Create Chevereto users database"""
-    db_path = "chevereto_users.db"
+def create_chevereto_users_db(base_dir: Optional[Path] = None):
+    """Create Chevereto users database in base_dir (default: current directory)"""
+    db_path = str(Path(base_dir or ".") / "chevereto_users.db")
     logger.info(f"Creating Chevereto users database: {db_path}")
     
     conn = sqlite3.connect(db_path)
@@ -54,9 +55,9 @@ def create_chevereto_users_db():
     conn.close()
     logger.info(f"✅ Created {db_path}")
 
-def create_discord_users_db():
-    """Create Discord users database"""
-    db_path = "discord_users.db"
+def create_discord_users_db(base_dir: Optional[Path] = None):
+    """Create Discord users database in base_dir (default: current directory)"""
+    db_path = str(Path(base_dir or ".") / "discord_users.db")
     logger.info(f"Creating Discord users database: {db_path}")
     
     conn = sqlite3.connect(db_path)
@@ -92,9 +93,9 @@ def create_discord_users_db():
     conn.close()
     logger.info(f"✅ Created {db_path}")
 
-def create_lora_database():
-    """Create LoRA database with sample data"""
-    db_path = "lora_database.db"
+def create_lora_database(base_dir: Optional[Path] = None):
+    """Create LoRA database with sample data in base_dir (default: current directory)"""
+    db_path = str(Path(base_dir or ".") / "lora_database.db")
     logger.info(f"Creating LoRA database: {db_path}")
     
     conn = sqlite3.connect(db_path)
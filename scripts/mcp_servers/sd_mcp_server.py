@@ -113,7 +113,10 @@ def _initialize_components():
         _image_uploader = None
     
     try:
-        _content_guide_manager = ContentGuideManager("modules/stable_diffusion/content_mapping.db")
+        # May be built in a startup worker thread and then used only from the event loop thread
+        _content_guide_manager = ContentGuideManager(
+            "modules/stable_diffusion/content_mapping.db", check_same_thread=False
+        )
         logger.info("✅ Content guide manager initialized")
     except Exception as e:
         logger.warning(f"⚠️ Content guide manager initialization failed: {e}")